@@ -1,3 +0,0 @@
-from .factory import AIAgentFactory
-
-__all__ = ['AIAgentFactory']
\ No newline at end of file
@@ -0,0 +1,9 @@
+from .factory import AIAgentFactory
+from .router import ModelRouter, HedgedAgent, LatencyTracker, LatencyTrackers, latency_trackers
+from .cascade import CascadeStats, cascade_stats
+from .replay import ReplayStore, RecordingAgent, ReplayAgent, ReplayMiss
+from .prompt_cache import PromptCacheStats, prompt_cache_stats
+
+__all__ = ['AIAgentFactory', 'ModelRouter', 'HedgedAgent', 'LatencyTracker', 'LatencyTrackers', 'latency_trackers', 'CascadeStats', 'cascade_stats',
+           'ReplayStore', 'RecordingAgent', 'ReplayAgent', 'ReplayMiss',
+           'PromptCacheStats', 'prompt_cache_stats']
\ No newline at end of file
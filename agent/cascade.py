@@ -0,0 +1,49 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class CascadeStats:
+    """Per doc type counters for cheap-model-first cascades; safe to share across threads"""
+
+    def __init__(self):
+        self.attempts: Dict[str, int] = defaultdict(int)
+        self.escalations: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, doc_type: str, escalated: bool) -> None:
+        with self._lock:
+            self.attempts[doc_type] += 1
+            if escalated:
+                self.escalations[doc_type] += 1
+
+    def escalation_rate(self, doc_type: str) -> float:
+        with self._lock:
+            return self._escalation_rate(doc_type)
+
+    def _escalation_rate(self, doc_type: str) -> float:
+        attempts = self.attempts.get(doc_type, 0)
+        if not attempts:
+            return 0.0
+        return self.escalations.get(doc_type, 0) / attempts
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Attempts, escalations and escalation rate for every doc type seen"""
+        with self._lock:
+            return {
+                doc_type: {
+                    "attempts": attempts,
+                    "escalations": self.escalations.get(doc_type, 0),
+                    "escalation_rate": self._escalation_rate(doc_type),
+                }
+                for doc_type, attempts in self.attempts.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.attempts.clear()
+            self.escalations.clear()
+
+
+# Shared by all processors unless one is given its own instance
+cascade_stats = CascadeStats()
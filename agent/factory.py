@@ -1,22 +1,39 @@
-from typing import Type, Dict, Any
-from pydantic_ai import Agent
+import importlib
+from typing import TYPE_CHECKING, Type, Dict, Any, Optional, Union
 from config.base import BaseConfig
+from agent.router import ModelRouter, HedgedAgent, latency_trackers
+from agent.replay import ReplayStore, RecordingAgent, ReplayAgent, replay_namespace
+from agent.prompt_cache import prompt_cache_settings
 from models.base import BaseAIModel
-from models.openai_model import OpenAIModel
-from models.anthropic_model import AnthropicModel
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
 
 class AIAgentFactory:
-    MODEL_MAPPING = {
-        "openai": OpenAIModel,
-        "anthropic": AnthropicModel,
+    # Providers are registered as "module:ClassName" and imported on first use,
+    # so only the SDK of the configured provider is ever loaded. Classes can
+    # still be registered directly.
+    MODEL_MAPPING: Dict[str, Union[str, Type[BaseAIModel]]] = {
+        "openai": "models.openai_model:OpenAIModel",
+        "anthropic": "models.anthropic_model:AnthropicModel",
+        "test": "models.fake_model:FakeModel",  # Offline, for local testing
         # Add more model implementations here
     }
 
     @staticmethod
-    def create_model(config: BaseConfig) -> BaseAIModel:
-        model_class = AIAgentFactory.MODEL_MAPPING.get(config.model_type)
+    def get_model_class(model_type: str) -> Type[BaseAIModel]:
+        model_class = AIAgentFactory.MODEL_MAPPING.get(model_type)
         if not model_class:
-            raise ValueError(f"Unsupported model type: {config.model_type}")
+            raise ValueError(f"Unsupported model type: {model_type}")
+        if isinstance(model_class, str):
+            module_name, class_name = model_class.split(":")
+            model_class = getattr(importlib.import_module(module_name), class_name)
+            AIAgentFactory.MODEL_MAPPING[model_type] = model_class
+        return model_class
+
+    @staticmethod
+    def create_model(config: BaseConfig) -> BaseAIModel:
+        model_class = AIAgentFactory.get_model_class(config.model_type)
         
         return model_class(
             model_name=config.model_name,
@@ -29,11 +46,72 @@ class AIAgentFactory:
     @staticmethod
     def create_agent(config: BaseConfig, 
                     output_type: Type, 
-                    system_prompt: str) -> Agent:
-        model = AIAgentFactory.create_model(config)
+                    system_prompt: str,
+                    doc_type: Optional[str] = None) -> Union["Agent", HedgedAgent, RecordingAgent, ReplayAgent]:
+        routed_config = ModelRouter.config_for(config, doc_type)
+        if config.replay_mode == "replay":
+            # No model is created, so replays need neither network nor API keys
+            return AIAgentFactory._with_replay(None, routed_config, output_type, system_prompt)
+
+        from pydantic_ai import Agent
+
+        model = AIAgentFactory.create_model(routed_config)
         
-        return Agent(
+        agent = Agent(
             model=model,
-            result_type=output_type,
-            system_prompt=system_prompt
-        ) 
\ No newline at end of file
+            output_type=output_type,
+            system_prompt=system_prompt,
+            model_settings=prompt_cache_settings(routed_config, doc_type) or None
+        )
+        if not config.hedge_model:
+            return AIAgentFactory._with_replay(agent, routed_config, output_type, system_prompt)
+
+        hedge_config = ModelRouter.apply_route(config, config.hedge_model)
+        hedge_agent = Agent(
+            model=AIAgentFactory.create_model(hedge_config),
+            output_type=output_type,
+            system_prompt=system_prompt,
+            model_settings=prompt_cache_settings(hedge_config, doc_type) or None
+        )
+        hedged = HedgedAgent(
+            primary=agent,
+            secondary=hedge_agent,
+            hedge_delay=config.hedge_delay,
+            min_samples=config.hedge_min_samples,
+            tracker=latency_trackers.get(doc_type, f"{routed_config.model_type}:{routed_config.model_name}")
+        )
+        return AIAgentFactory._with_replay(hedged, routed_config, output_type, system_prompt)
+
+    @staticmethod
+    def create_cascade_agent(config: BaseConfig,
+                             output_type: Type,
+                             system_prompt: str,
+                             doc_type: Optional[str] = None) -> Optional[Union["Agent", RecordingAgent, ReplayAgent]]:
+        """Agent for the cheap first stage of a cascade, if one is configured"""
+        if not config.cascade_model:
+            return None
+
+        cascade_config = ModelRouter.apply_route(config, config.cascade_model)
+        if config.replay_mode == "replay":
+            return AIAgentFactory._with_replay(None, cascade_config, output_type, system_prompt)
+
+        from pydantic_ai import Agent
+        agent = Agent(
+            model=AIAgentFactory.create_model(cascade_config),
+            output_type=output_type,
+            system_prompt=system_prompt,
+            model_settings=prompt_cache_settings(cascade_config, doc_type) or None
+        )
+        return AIAgentFactory._with_replay(agent, cascade_config, output_type, system_prompt)
+
+    @staticmethod
+    def _with_replay(agent: Any, config: BaseConfig, output_type: Type, system_prompt: str) -> Any:
+        """Wrap an agent for record/replay according to config.replay_mode"""
+        if not config.replay_mode:
+            return agent
+
+        store = ReplayStore(config.replay_dir)
+        namespace = replay_namespace(config.model_type, config.model_name, output_type, system_prompt)
+        if config.replay_mode == "replay":
+            return ReplayAgent(store, namespace, output_type)
+        return RecordingAgent(agent, store, namespace, output_type)
\ No newline at end of file
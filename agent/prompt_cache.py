@@ -0,0 +1,119 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional
+from config.base import BaseConfig
+
+
+def prompt_cache_settings(config: BaseConfig, doc_type: Optional[str]) -> Dict[str, Any]:
+    """
+    Provider model settings that let the static prompt prefix (tool schema and
+    the system prompt, which carries the extraction instructions) be served
+    from the provider's prompt cache.
+    """
+    if not config.prompt_caching:
+        return {}
+    if config.model_type == "anthropic":
+        # Anthropic only caches up to explicit cache_control breakpoints.
+        # These settings need pydantic-ai 1.18 or later; older releases drop unknown keys.
+        return {
+            "anthropic_cache_tool_definitions": True,
+            "anthropic_cache_instructions": True,
+        }
+    if config.model_type == "openai":
+        # OpenAI caches prefixes automatically; a stable key keeps requests with
+        # the same prefix on the same cache shard
+        return {"extra_body": {"prompt_cache_key": f"gov-doc-parser:{doc_type or 'default'}"}}
+    return {}
+
+
+def _usage_value(usage: Any, *names: str) -> int:
+    for name in names:
+        value = getattr(usage, name, None)
+        if value:
+            return value
+    details = getattr(usage, "details", None) or {}
+    for name in names:
+        if details.get(name):
+            return details[name]
+    return 0
+
+
+class PromptCacheStats:
+    """
+    Per doc type prompt cache hits, cached input tokens and latency; safe to
+    share across threads. Full request latency and streamed time to first token
+    are kept as separate series, split by cache hit.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.input_tokens: Dict[str, int] = defaultdict(int)
+        self.cached_tokens: Dict[str, int] = defaultdict(int)
+        self.latency: Dict[str, Dict[bool, float]] = defaultdict(lambda: defaultdict(float))
+        self.latency_calls: Dict[str, Dict[bool, int]] = defaultdict(lambda: defaultdict(int))
+        self.first_token: Dict[str, Dict[bool, float]] = defaultdict(lambda: defaultdict(float))
+        self.first_token_calls: Dict[str, Dict[bool, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def record(self, doc_type: str, usage: Any, seconds: Optional[float] = None, streamed: bool = False) -> None:
+        """
+        Record one model call from its pydantic_ai usage object. seconds is the
+        full request latency, or the time to first token when streamed.
+        """
+        if usage is None:
+            return
+        input_tokens = _usage_value(usage, "input_tokens", "request_tokens")
+        cached = _usage_value(usage, "cache_read_tokens", "cached_tokens", "cache_read_input_tokens")
+        hit = cached > 0
+        with self._lock:
+            self.calls[doc_type] += 1
+            self.hits[doc_type] += hit
+            self.input_tokens[doc_type] += input_tokens
+            self.cached_tokens[doc_type] += cached
+            if seconds is not None:
+                totals, counts = ((self.first_token, self.first_token_calls) if streamed
+                                  else (self.latency, self.latency_calls))
+                totals[doc_type][hit] += seconds
+                counts[doc_type][hit] += 1
+
+    @staticmethod
+    def _mean(totals: Dict[str, Dict[bool, float]], counts: Dict[str, Dict[bool, int]],
+              doc_type: str, hit: bool) -> Optional[float]:
+        calls = counts[doc_type][hit]
+        return totals[doc_type][hit] / calls if calls else None
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Hit rate, share of input tokens served from cache, and mean latency and
+        time to first token with and without a hit
+        """
+        with self._lock:
+            return {
+                doc_type: {
+                    "calls": calls,
+                    "hit_rate": self.hits[doc_type] / calls,
+                    "cached_input_ratio": (self.cached_tokens[doc_type] / self.input_tokens[doc_type]
+                                           if self.input_tokens[doc_type] else 0.0),
+                    "mean_latency_hit": self._mean(self.latency, self.latency_calls, doc_type, True),
+                    "mean_latency_miss": self._mean(self.latency, self.latency_calls, doc_type, False),
+                    "mean_first_token_hit": self._mean(self.first_token, self.first_token_calls, doc_type, True),
+                    "mean_first_token_miss": self._mean(self.first_token, self.first_token_calls, doc_type, False),
+                }
+                for doc_type, calls in self.calls.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.hits.clear()
+            self.input_tokens.clear()
+            self.cached_tokens.clear()
+            self.latency.clear()
+            self.latency_calls.clear()
+            self.first_token.clear()
+            self.first_token_calls.clear()
+
+
+# Shared by all processors unless one is given its own instance
+prompt_cache_stats = PromptCacheStats()
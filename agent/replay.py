@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Type
+from pydantic import BaseModel
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode when no recorded response exists for a prompt"""
+
+
+@dataclass
+class ReplayResult:
+    """Stand-in for pydantic_ai's AgentRunResult; processors only read .output"""
+    output: Any
+
+
+class ReplayStore:
+    """
+    On-disk store of structured model responses keyed by a hash of the model,
+    output type, system prompt and user prompt. One JSON file per response under
+    <directory>/<first two hex chars>/<hash>.json.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def key(namespace: str, prompt: str) -> str:
+        return hashlib.sha256(json.dumps([namespace, prompt]).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent runs never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+def replay_namespace(model_type: str, model_name: str, output_type: Type[BaseModel], system_prompt: str) -> str:
+    system_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+    return f"{model_type}:{model_name}:{output_type.__name__}:{system_hash}"
+
+
+class RecordingAgent:
+    """Wraps an agent and stores every structured response it returns"""
+
+    def __init__(self, agent: Any, store: ReplayStore, namespace: str, output_type: Type[BaseModel]):
+        self.agent = agent
+        self.store = store
+        self.namespace = namespace
+        self.output_type = output_type
+
+    def _save(self, prompt: str, output: BaseModel, output_type: Optional[Type[BaseModel]]) -> None:
+        self.store.save(self.store.key(self.namespace, prompt), {
+            "namespace": self.namespace,
+            "output_type": (output_type or self.output_type).__name__,
+            "prompt": prompt,
+            "response": output.model_dump(mode="json"),
+        })
+
+    async def run(self, prompt: str, **kwargs) -> Any:
+        result = await self.agent.run(prompt, **kwargs)
+        self._save(prompt, result.output, kwargs.get("output_type"))
+        return result
+
+    @asynccontextmanager
+    async def run_stream(self, prompt: str, **kwargs):
+        """Streams are passed through; the final output is recorded once the stream is read to the end"""
+        async with self.agent.run_stream(prompt, **kwargs) as result:
+            stream = _RecordingStream(result)
+            yield stream
+        if stream.complete:
+            self._save(prompt, stream.last, kwargs.get("output_type"))
+
+
+class _RecordingStream:
+    """Proxy for a streamed run that remembers the last (complete) output"""
+
+    def __init__(self, result: Any):
+        self._result = result
+        self.last = None
+        self.complete = False
+
+    async def stream_output(self, *args, **kwargs) -> AsyncIterator[Any]:
+        async with aclosing(self._result.stream_output(*args, **kwargs)) as outputs:
+            async for output in outputs:
+                self.last = output
+                yield output
+        self.complete = self.last is not None
+
+    def __getattr__(self, name: str) -> Any:
+        # usage() and the rest of the result API are served by the wrapped stream
+        return getattr(self._result, name)
+
+
+class _ReplayStream:
+    def __init__(self, output: Any):
+        self.output = output
+
+    async def stream_output(self) -> AsyncIterator[Any]:
+        yield self.output
+
+
+class ReplayAgent:
+    """Serves agent.run from a ReplayStore without creating a model or touching the network"""
+
+    def __init__(self, store: ReplayStore, namespace: str, output_type: Type[BaseModel]):
+        self.store = store
+        self.namespace = namespace
+        self.output_type = output_type
+
+    def _load(self, prompt: str, output_type: Optional[Type[BaseModel]]) -> ReplayResult:
+        key = self.store.key(self.namespace, prompt)
+        entry = self.store.load(key)
+        if entry is None:
+            raise ReplayMiss(f"No recorded response for prompt {key} in {self.store.directory}")
+        return ReplayResult(output=(output_type or self.output_type).model_validate(entry["response"]))
+
+    async def run(self, prompt: str, output_type: Optional[Type[BaseModel]] = None, **kwargs) -> ReplayResult:
+        return self._load(prompt, output_type)
+
+    @asynccontextmanager
+    async def run_stream(self, prompt: str, output_type: Optional[Type[BaseModel]] = None, **kwargs):
+        yield _ReplayStream(self._load(prompt, output_type).output)
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from config.base import BaseConfig, ModelRouteConfig
+
+
+class LatencyTracker:
+    """Rolling window of request latencies used to pick the hedge delay"""
+
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=window)
+        # Trackers are shared by processors in different threads (e.g. CLI workers)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+
+class LatencyTrackers:
+    """
+    One LatencyTracker per (doc type, model), shared by every processor in the
+    process so the p95 hedge delay is learned across documents rather than
+    per processor instance.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._trackers: Dict[Tuple[Optional[str], str], LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, doc_type: Optional[str], model: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get((doc_type, model))
+            if tracker is None:
+                tracker = self._trackers[(doc_type, model)] = LatencyTracker(self.window)
+            return tracker
+
+    def reset(self) -> None:
+        with self._lock:
+            self._trackers.clear()
+
+
+# Shared by all hedged agents unless one is given its own tracker
+latency_trackers = LatencyTrackers()
+
+
+class ModelRouter:
+    """Resolves the effective model config for a doc type"""
+
+    @staticmethod
+    def apply_route(config: BaseConfig, route: ModelRouteConfig) -> BaseConfig:
+        return config.model_copy(update={
+            "model_type": route.model_type,
+            "model_name": route.model_name,
+            "api_key": route.api_key or config.api_key,
+            "additional_params": {**config.additional_params, **route.additional_params},
+        })
+
+    @staticmethod
+    def config_for(config: BaseConfig, doc_type: Optional[str]) -> BaseConfig:
+        route = config.model_routes.get(doc_type) if doc_type else None
+        if route is None:
+            return config
+        return ModelRouter.apply_route(config, route)
+
+
+class HedgedAgent:
+    """
+    Runs the primary agent and, if it has not answered within the hedge delay,
+    races a duplicate request against the secondary agent. The first successful
+    response wins and the other request is cancelled.
+    """
+
+    def __init__(self,
+                 primary: Any,
+                 secondary: Any,
+                 hedge_delay: Optional[float] = None,
+                 min_samples: int = 20,
+                 tracker: Optional[LatencyTracker] = None):
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_delay = hedge_delay
+        self.min_samples = min_samples
+        self.tracker = tracker if tracker is not None else LatencyTracker()
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    def current_delay(self) -> Optional[float]:
+        """Fixed delay if configured, otherwise the observed p95 of the primary"""
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        if len(self.tracker) < self.min_samples:
+            return None
+        return self.tracker.percentile(95)
+
+    async def run(self, *args, **kwargs) -> Any:
+        started = time.perf_counter()
+        primary = asyncio.create_task(self.primary.run(*args, **kwargs))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.current_delay())
+            if done:
+                self.tracker.record(time.perf_counter() - started)
+                return primary.result()
+
+            self.hedged_requests += 1
+            pending.add(asyncio.create_task(self.secondary.run(*args, **kwargs)))
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is primary:
+                        self.tracker.record(time.perf_counter() - started)
+                    else:
+                        self.hedge_wins += 1
+                    return task.result()
+            raise error
+        finally:
+            if primary in pending:
+                # The primary is being cancelled (the hedge won, or the caller gave up).
+                # It took at least this long; leaving it out would bias the p95,
+                # and so the hedge delay, low.
+                self.tracker.record(time.perf_counter() - started)
+            # Cancel the losing request so its HTTP call is aborted
+            for task in pending:
+                task.cancel()
+
+    def run_stream(self, *args, **kwargs) -> Any:
+        """Streams are not hedged; partial output comes from the primary only"""
+        return self.primary.run_stream(*args, **kwargs)
+
+    def run_sync(self, *args, **kwargs) -> Any:
+        return asyncio.run(self.run(*args, **kwargs))
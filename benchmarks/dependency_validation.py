@@ -0,0 +1,88 @@
+"""
+Per-call overhead of DependencyManager.validate_dependencies for Form 16
+dependency payloads, compared with the previous uncompiled validation.
+Run from the repo root:
+
+    python benchmarks/dependency_validation.py --items 10000 --calls 200
+"""
+import argparse
+import os
+import sys
+import timeit
+from typing import Any, Dict, List, get_args, get_origin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.base import DependencyConfig
+from dependencies.manager import DependencyManager
+from processors.data_classes.form_16_dataclass import (
+    ChallanDetails, PaymentSummary, TaxDeductedSummary, TaxDeductionDeposit, TaxDepositDetails
+)
+
+LIST_DEPENDENCIES = {
+    "summary_of_payment": (PaymentSummary, {"amount": "1000", "nature": "salary", "date": "2024-04-01"}),
+    "summary_of_tax_deducted_at_source": (TaxDeductedSummary, {
+        "quarter": "Q1", "receipt_numbers": "ABC", "amount_of_tax_deducted": "10", "amount_of_tax_deposited": "10"
+    }),
+    "details_of_tax_deposited": (TaxDepositDetails, {
+        "tax_deposited_through_book_adjustment": "0",
+        "tax_deposited_through_challan": [ChallanDetails(
+            challan_identification_number="1", bsr_code="0510002", date_of_deposit="2024-05-07",
+            challan_serial_number="1", status_of_matching_with_oltas="F"
+        )],
+    }),
+    "tax_deposited_in_respect_of_deduction": (TaxDeductionDeposit, {"s_no": "1", "amount_of_tax_deducted": "10"}),
+}
+
+
+def build_case(items: int):
+    configs = {}
+    payload = {}
+    for name, (model, fields) in LIST_DEPENDENCIES.items():
+        configs[name] = DependencyConfig(name=name, type=List[model], description=name, required=False)
+        item = model(**fields)
+        payload[name] = [item] * items
+    return configs, payload
+
+
+def legacy_validate(configs: Dict[str, DependencyConfig], dependencies: Dict[str, Any]) -> Dict[str, Any]:
+    """The validation loop as it was before validators were compiled"""
+    validated = {}
+    for dep_name, dep_config in configs.items():
+        if dep_name not in dependencies and dep_config.required:
+            raise ValueError(f"Required dependency '{dep_name}' not provided")
+        if dep_name in dependencies:
+            value = dependencies[dep_name]
+            base_type = get_origin(dep_config.type) or dep_config.type
+            if base_type is list:
+                item_type = get_args(dep_config.type)[0]
+                ok = isinstance(value, list) and all(isinstance(item, item_type) for item in value)
+            else:
+                ok = isinstance(value, base_type)
+            if not ok:
+                raise TypeError(f"Dependency '{dep_name}' has the wrong type")
+            validated[dep_name] = value
+    return validated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000, help="List items per dependency")
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    configs, payload = build_case(args.items)
+    manager = DependencyManager(configs)
+
+    legacy = min(timeit.repeat(lambda: legacy_validate(configs, payload), number=args.calls, repeat=3))
+    compiled = min(timeit.repeat(lambda: manager.validate_dependencies(payload), number=args.calls, repeat=3))
+    empty = min(timeit.repeat(lambda: manager.validate_dependencies({}), number=args.calls * 100, repeat=3))
+
+    print(f"{args.items} items x {len(payload)} list dependencies, {args.calls} calls")
+    print(f"legacy    {legacy / args.calls * 1e6:>12.1f} us/call")
+    print(f"compiled  {compiled / args.calls * 1e6:>12.1f} us/call  ({legacy / compiled:.2f}x)")
+    print(f"empty     {empty / (args.calls * 100) * 1e6:>12.2f} us/call (no dependencies supplied)")
+
+
+if __name__ == "__main__":
+    main()
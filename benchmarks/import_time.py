@@ -0,0 +1,106 @@
+"""
+Cold import benchmark.
+
+Imports each target module in a fresh interpreter, reports the median wall
+time and which heavy dependencies ended up in sys.modules. Run from the repo
+root:
+
+    python benchmarks/import_time.py --runs 10
+    python benchmarks/import_time.py --baseline <git ref>   # before/after comparison
+
+With --baseline the same modules are also imported from a copy of the tree
+at that ref (exported with git archive), in the same interpreter environment.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+HEAVY_MODULES = ["cv2", "numpy", "pytesseract", "PyPDF2", "pydantic_ai", "openai", "anthropic"]
+
+DEFAULT_TARGETS = [
+    "processors",
+    "processors.pan",
+    "agent.factory",
+    "document_processor",
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def export_tree(ref: str, target: str) -> None:
+    """Write the repository at ref into target"""
+    archive = subprocess.run(["git", "archive", ref], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def measure(module: str, runs: int, root: str = ROOT) -> dict:
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=root,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1]}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        loaded = result["loaded"]
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "heavy_loaded": loaded,
+    }
+
+
+def _describe(result: dict) -> str:
+    if "error" in result:
+        return f"failed: {result['error']}"
+    heavy = ", ".join(result["heavy_loaded"]) or "-"
+    return f"{result['median_ms']:>9.2f} ms   heavy deps loaded: {heavy}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", metavar="REF", help="Also measure the tree at this git ref")
+    args = parser.parse_args()
+
+    if not args.baseline:
+        for module in args.modules:
+            print(f"{module:<24} {_describe(measure(module, args.runs))}")
+        return
+
+    with tempfile.TemporaryDirectory(prefix="import-baseline-") as baseline_root:
+        export_tree(args.baseline, baseline_root)
+        for module in args.modules:
+            before = measure(module, args.runs, baseline_root)
+            after = measure(module, args.runs)
+            print(module)
+            print(f"  {args.baseline[:12]:<12} {_describe(before)}")
+            print(f"  {'working tree':<12} {_describe(after)}")
+            if "error" not in before and "error" not in after:
+                print(f"  speedup      {before['median_ms'] / after['median_ms']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
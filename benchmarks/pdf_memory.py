@@ -0,0 +1,79 @@
+"""
+Peak RSS of building a Form 16 prompt from a large PDF, comparing the previous
+all-in-memory path with the bounded-memory page window. Each mode runs in a
+fresh interpreter so peak RSS is not shared. Run from the repo root:
+
+    python benchmarks/pdf_memory.py bundle.pdf --window-pages 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from PyPDF2 import PdfReader
+from processors.pdf import iter_pdf_chunks
+from processors.base import DocumentProcessor
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+baseline = rss_mb()
+start = time.perf_counter()
+if {mode!r} == "legacy":
+    reader = PdfReader({path!r})
+    chunks, current = [], ""
+    for page in reader.pages:
+        text = page.extract_text()
+        if len(current) + len(text) > {chunk_size}:
+            chunks.append(current)
+            current = text
+        else:
+            current += text
+    if current:
+        chunks.append(current)
+    extracted_text = "\\n".join(chunks)
+    prompt = f"Document Text:\\n{{extracted_text}}\\nInstructions"
+else:
+    chunks = iter_pdf_chunks({path!r}, {chunk_size}, window_pages={window}, max_bytes={max_bytes})
+    prompt = DocumentProcessor._join_prompt("Document Text:\\n", chunks, "\\nInstructions")
+elapsed = time.perf_counter() - start
+print(json.dumps({{"peak_rss_mb": rss_mb(), "delta_mb": rss_mb() - baseline,
+                   "seconds": elapsed, "prompt_chars": len(prompt)}}))
+"""
+
+
+def run(mode: str, args) -> dict:
+    code = _CHILD.format(root=ROOT, mode=mode, path=os.path.abspath(args.pdf), chunk_size=args.chunk_size,
+                         window=args.window_pages, max_bytes=args.max_bytes)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf")
+    parser.add_argument("--chunk-size", type=int, default=4000)
+    parser.add_argument("--window-pages", type=int, default=10)
+    parser.add_argument("--max-bytes", type=int, default=None)
+    args = parser.parse_args()
+
+    for mode in ("legacy", "windowed"):
+        result = run(mode, args)
+        if "error" in result:
+            print(f"{mode:<9} failed: {result['error']}")
+            continue
+        print(f"{mode:<9} peak RSS {result['peak_rss_mb']:>8.1f} MB  "
+              f"(+{result['delta_mb']:.1f} MB over imports)  "
+              f"{result['seconds']:.2f}s  prompt {result['prompt_chars']} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from .bulk import main, run
+
+__all__ = ['main', 'run']
\ No newline at end of file
@@ -0,0 +1,259 @@
+"""
+gov-doc-parser: bulk extraction over files, directories and zip/tar archives.
+
+    gov-doc-parser scans/ uploads.zip -o results.jsonl --workers 8
+    gov-doc-parser scans/ -o results.jsonl --checkpoint run.ckpt   # re-run to resume
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from config.base import BaseConfig
+from processors.registry import PROCESSOR_REGISTRY, SUPPORTED_EXTENSIONS, create_processor, detect_doc_type
+from serialization import dump_json, to_jsonable
+
+API_KEY_ENV = {
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+}
+
+
+@dataclass
+class Document:
+    key: str  # Stable identifier used in the output and checkpoint
+    file_path: str
+    temporary: bool = False  # Extracted from an archive; removed once processed
+
+
+@dataclass
+class Outcome:
+    key: str
+    doc_type: Optional[str]
+    latency: float
+    result: object = None
+    error: Optional[str] = None
+
+
+def _is_supported(name: str) -> bool:
+    return name.rsplit(".", 1)[-1].lower() in SUPPORTED_EXTENSIONS
+
+
+def _extract_member(data: bytes, name: str, workdir: str) -> str:
+    # Keep the member's base name so doc type detection still works
+    target_dir = tempfile.mkdtemp(dir=workdir)
+    target = os.path.join(target_dir, os.path.basename(name))
+    with open(target, "wb") as f:
+        f.write(data)
+    return target
+
+
+def iter_documents(inputs: List[str], workdir: str) -> Iterator[Document]:
+    """Yield supported documents from files, directories and archives. Archive members are extracted lazily."""
+    for source in inputs:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    if _is_supported(name):
+                        yield Document(key=path, file_path=path)
+                    elif zipfile.is_zipfile(path) or tarfile.is_tarfile(path):
+                        yield from iter_documents([path], workdir)
+        elif zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and _is_supported(info.filename):
+                        path = _extract_member(archive.read(info), info.filename, workdir)
+                        yield Document(key=f"{source}!{info.filename}", file_path=path, temporary=True)
+        elif os.path.isfile(source) and tarfile.is_tarfile(source):
+            with tarfile.open(source) as archive:
+                for member in archive:
+                    if member.isfile() and _is_supported(member.name):
+                        data = archive.extractfile(member).read()
+                        path = _extract_member(data, member.name, workdir)
+                        yield Document(key=f"{source}!{member.name}", file_path=path, temporary=True)
+        elif os.path.isfile(source) and _is_supported(source):
+            yield Document(key=source, file_path=source)
+        else:
+            print(f"Skipping unsupported input: {source}", file=sys.stderr)
+
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+async def process_document(document: Document,
+                           doc_type: Optional[str],
+                           get_processor: Callable[[str], Any]) -> Outcome:
+    """Process one document with the run's shared processor for its doc type"""
+    started = time.perf_counter()
+    doc_type = doc_type or detect_doc_type(document.file_path)
+    try:
+        if doc_type is None:
+            raise ValueError("Could not detect document type; pass --doc-type")
+        result = await get_processor(doc_type).process(document.file_path)
+        return Outcome(document.key, doc_type, time.perf_counter() - started, result=result)
+    except Exception as e:
+        return Outcome(document.key, doc_type, time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+    finally:
+        if document.temporary:
+            shutil.rmtree(os.path.dirname(document.file_path), ignore_errors=True)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def print_summary(outcomes: List[Outcome], skipped: int, elapsed: float) -> None:
+    succeeded = sum(1 for outcome in outcomes if outcome.error is None)
+    latencies = [outcome.latency for outcome in outcomes]
+    print(f"Processed {len(outcomes)} documents in {elapsed:.1f}s "
+          f"({succeeded} succeeded, {len(outcomes) - succeeded} failed, {skipped} skipped from checkpoint)",
+          file=sys.stderr)
+    if latencies:
+        print(f"Throughput {len(outcomes) / elapsed:.2f} docs/s | latency "
+              f"p50 {statistics.median(latencies):.2f}s  p95 {_percentile(latencies, 95):.2f}s  "
+              f"max {max(latencies):.2f}s", file=sys.stderr)
+
+
+def run(inputs: List[str],
+        output: str,
+        config: BaseConfig,
+        doc_type: Optional[str] = None,
+        workers: int = 4,
+        checkpoint: Optional[str] = None) -> List[Outcome]:
+    """
+    Process every input with up to `workers` documents in flight on one event
+    loop. Processors are built once per doc type and shared, so model
+    connections are kept alive across documents; PDF parsing and OCR run in
+    worker threads inside the processors.
+    """
+    return asyncio.run(_run(inputs, output, config, doc_type, workers, checkpoint))
+
+
+async def _run(inputs: List[str],
+               output: str,
+               config: BaseConfig,
+               doc_type: Optional[str],
+               workers: int,
+               checkpoint: Optional[str]) -> List[Outcome]:
+    done_keys = load_checkpoint(checkpoint)
+    outcomes: List[Outcome] = []
+    skipped = 0
+    started = time.perf_counter()
+    processors: Dict[str, Any] = {}
+
+    def get_processor(doc_type: str) -> Any:
+        processor = processors.get(doc_type)
+        if processor is None:
+            processor = processors[doc_type] = create_processor(doc_type, config)
+        return processor
+
+    with tempfile.TemporaryDirectory(prefix="gov-doc-parser-") as workdir, \
+            open(output, "a", encoding="utf-8") as out, \
+            open(checkpoint or os.devnull, "a", encoding="utf-8") as ckpt:
+        pending: Set[asyncio.Task] = set()
+
+        async def drain(return_when) -> None:
+            finished, _ = await asyncio.wait(pending, return_when=return_when)
+            for task in finished:
+                pending.discard(task)
+                outcome = task.result()
+                outcomes.append(outcome)
+                record = {"file": outcome.key, "doc_type": outcome.doc_type,
+                          "latency_ms": round(outcome.latency * 1000, 1)}
+                if outcome.error is None:
+                    record["result"] = to_jsonable(outcome.result)
+                else:
+                    record["error"] = outcome.error
+                out.write(dump_json(record) + "\n")
+                out.flush()
+                # Only successes are checkpointed so failures are retried on resume
+                if outcome.error is None:
+                    ckpt.write(outcome.key + "\n")
+                    ckpt.flush()
+
+        documents = iter_documents(inputs, workdir)
+        while True:
+            # Directory walks and archive extraction run in a thread so in-flight
+            # documents keep making progress; at most `workers` are extracted ahead
+            document = await asyncio.to_thread(next, documents, None)
+            if document is None:
+                break
+            if document.key in done_keys:
+                skipped += 1
+                if document.temporary:
+                    shutil.rmtree(os.path.dirname(document.file_path), ignore_errors=True)
+                continue
+            pending.add(asyncio.create_task(process_document(document, doc_type, get_processor)))
+            if len(pending) >= workers:
+                await drain(asyncio.FIRST_COMPLETED)
+        if pending:
+            await drain(asyncio.ALL_COMPLETED)
+
+    print_summary(outcomes, skipped, time.perf_counter() - started)
+    return outcomes
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="gov-doc-parser",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("inputs", nargs="+", help="Files, directories or zip/tar archives")
+    parser.add_argument("-o", "--output", required=True, help="JSON Lines output file (appended to)")
+    parser.add_argument("--doc-type", choices=sorted(PROCESSOR_REGISTRY),
+                        help="Document type for every input (default: detect from file name)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Documents processed concurrently")
+    parser.add_argument("--checkpoint", help="File of completed inputs; re-running with it resumes the run")
+    parser.add_argument("--timeout", type=float, help="Seconds allowed per document")
+    parser.add_argument("--stage-timeout", action="append", default=[], metavar="STAGE=SECONDS",
+                        help="Budget for the ocr, pdf or model stage; repeatable")
+    parser.add_argument("--model-type", choices=sorted(API_KEY_ENV), default="openai")
+    parser.add_argument("--model-name", default="gpt-4o-mini")
+    parser.add_argument("--api-key", help="Defaults to OPENAI_API_KEY / ANTHROPIC_API_KEY")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    api_key = args.api_key or os.environ.get(API_KEY_ENV[args.model_type])
+    if not api_key:
+        print(f"No API key: pass --api-key or set {API_KEY_ENV[args.model_type]}", file=sys.stderr)
+        return 2
+
+    try:
+        stage_timeouts = {stage: float(seconds) for stage, seconds in
+                          (item.split("=", 1) for item in args.stage_timeout)}
+    except ValueError:
+        print("--stage-timeout must look like ocr=30", file=sys.stderr)
+        return 2
+
+    config = BaseConfig(model_type=args.model_type, model_name=args.model_name, api_key=api_key,
+                        request_timeout=args.timeout, stage_timeouts=stage_timeouts)
+    outcomes = run(args.inputs, args.output, config, doc_type=args.doc_type,
+                   workers=args.workers, checkpoint=args.checkpoint)
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,3 @@
-from .base import BaseConfig
+from .base import BaseConfig, ModelRouteConfig
 
-__all__ = ['BaseConfig']
\ No newline at end of file
+__all__ = ['BaseConfig', 'ModelRouteConfig']
\ No newline at end of file
@@ -1,6 +1,26 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, Literal, Type, Union, get_origin, get_args
+from pydantic import BaseModel, PrivateAttr
+from typing import Optional, Dict, Any, Callable, Literal, Type, Union, get_origin, get_args
 from dataclasses import dataclass
+from itertools import repeat
+
+def compile_type_check(expected: Any) -> Callable[[Any], bool]:
+    """Resolve generics once and return a closure performing the type check"""
+    if expected is Any:
+        return lambda value: True
+
+    base_type = get_origin(expected) or expected
+    if base_type is list:
+        args = get_args(expected)
+        if not args:
+            return lambda value: isinstance(value, list)
+        item_type = get_origin(args[0]) or args[0]
+
+        def check_list(value: Any) -> bool:
+            # map() keeps the per-item isinstance loop in C
+            return isinstance(value, list) and all(map(isinstance, value, repeat(item_type)))
+        return check_list
+
+    return lambda value: isinstance(value, base_type)
 
 class DependencyConfig(BaseModel):
     """Configuration for dependencies that will be passed to the model"""
@@ -8,24 +28,32 @@ class DependencyConfig(BaseModel):
     type: Union[Type, Any]  # Changed from Type to Union[Type, Any] to handle complex types
     description: str
     required: bool = True
+    _check: Optional[Callable[[Any], bool]] = PrivateAttr(default=None)
+    _check_type: Any = PrivateAttr(default=None)
 
     class Config:
         arbitrary_types_allowed = True  # Allow arbitrary types including generics
 
+    def compile_check(self) -> Callable[[Any], bool]:
+        """Type check closure for this dependency, compiled on first use and cached"""
+        if self._check is None or self._check_type is not self.type:
+            self._check = compile_type_check(self.type)
+            self._check_type = self.type
+        return self._check
+
     def validate_type(self, value: Any) -> bool:
         """Validate complex types including Lists and other generic types"""
-        base_type = get_origin(self.type) or self.type
-        if base_type is list:
-            if not isinstance(value, list):
-                return False
-            # Get the type argument of the list
-            item_type = get_args(self.type)[0]
-            # Check each item in the list
-            return all(isinstance(item, item_type) for item in value)
-        return isinstance(value, base_type)
+        return self.compile_check()(value)
+
+class ModelRouteConfig(BaseModel):
+    """Model override used for routing a doc type or hedging a request"""
+    model_type: Literal["openai", "anthropic", "test"]
+    model_name: str
+    api_key: Optional[str] = None  # Falls back to BaseConfig.api_key
+    additional_params: Dict[str, Any] = {}
 
 class BaseConfig(BaseModel):
-    model_type: Literal["openai", "anthropic"]  # Add more as needed
+    model_type: Literal["openai", "anthropic", "test"]  # Add more as needed
     api_key: str
     model_name: str
     temperature: float = 0.7
@@ -33,6 +61,35 @@ class BaseConfig(BaseModel):
     additional_params: Dict[str, Any] = {}
     dependencies: Dict[str, DependencyConfig] = {}
     chunk_size: Optional[int] = 4000  # Added chunk_size with default value
+    # Measure chunks in tokens, sized from the model context window instead of chunk_size
+    chunk_by_tokens: bool = False
+    context_window: Optional[int] = None  # Overrides the known window for model_name
+    reserved_output_tokens: int = 4096
+    # With chunk_by_tokens each chunk is one model call; this caps how many run at once
+    max_concurrent_chunks: int = 4
+    # Bounded-memory PDF mode: release page objects every N pages
+    pdf_window_pages: Optional[int] = None
+    max_document_bytes: Optional[int] = None  # Reject documents whose text exceeds this
+    # dedup.NearDuplicateIndex shared by processors to catch re-photographed cards
+    duplicate_index: Optional[Any] = None
+    # "record" stores structured responses on disk; "replay" serves them without calling the model
+    replay_mode: Optional[Literal["record", "replay"]] = None
+    replay_dir: str = ".replay"
+    # Overall per-document deadline in seconds, and optional budgets for the
+    # "ocr", "pdf" and "model" stages
+    request_timeout: Optional[float] = None
+    stage_timeouts: Dict[str, float] = {}
+    # Send provider prompt-caching hints for the static prompt prefix
+    prompt_caching: bool = True
+    # Per doc type model overrides, e.g. {"pan": ModelRouteConfig(...)}
+    model_routes: Dict[str, ModelRouteConfig] = {}
+    # Secondary model raced against the primary once hedge_delay has elapsed
+    hedge_model: Optional[ModelRouteConfig] = None
+    # Seconds to wait before hedging; None uses the observed p95 latency
+    hedge_delay: Optional[float] = None
+    hedge_min_samples: int = 20  # Primary samples needed before the p95 is trusted
+    # Cheap model tried first; escalates to the configured model when validate() fails
+    cascade_model: Optional[ModelRouteConfig] = None
 
     class Config:
         arbitrary_types_allowed = True
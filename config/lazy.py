@@ -0,0 +1,19 @@
+import importlib
+from typing import Any, Callable, Dict
+
+
+def lazy_getattr(module_name: str, module_globals: Dict[str, Any], imports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Module-level __getattr__ that imports each name in imports ({name: module,
+    relative to module_name}) on first access and caches it in the module, so
+    later lookups skip __getattr__ entirely.
+
+        __getattr__ = lazy_getattr(__name__, globals(), {'PANProcessor': '.pan'})
+    """
+    def __getattr__(name: str) -> Any:
+        if name in imports:
+            value = getattr(importlib.import_module(imports[name], module_name), name)
+            module_globals[name] = value
+            return value
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+    return __getattr__
@@ -0,0 +1,5 @@
+from .phash import dhash, phash, hamming
+from .mih import MultiIndexHash
+from .index import NearDuplicateIndex, DuplicateMatch
+
+__all__ = ['dhash', 'phash', 'hamming', 'MultiIndexHash', 'NearDuplicateIndex', 'DuplicateMatch']
\ No newline at end of file
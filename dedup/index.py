@@ -0,0 +1,78 @@
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Literal, Optional, Tuple
+import numpy as np
+from dedup.mih import MultiIndexHash
+from dedup.phash import HASH_FUNCTIONS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DuplicateMatch:
+    key: Optional[str]
+    distance: int
+    image_hash: int
+    result: Any
+    doc_type: Optional[str] = None
+
+
+class NearDuplicateIndex:
+    """
+    Perceptual-hash index of previously extracted card images, with one
+    multi-index hash table per doc type so an Aadhaar back is never matched
+    against Aadhaar fronts. Lookups probe max_distance + 1 exact-match bucket
+    tables, so they stay in the millisecond range at millions of stored hashes.
+
+    on_match='reuse' returns the stored extraction for a near-duplicate upload
+    instead of calling the model; on_match='flag' still extracts but records
+    (key, match) in flagged for review.
+    """
+
+    def __init__(self,
+                 max_distance: int = 6,
+                 hash_method: Literal["phash", "dhash"] = "phash",
+                 on_match: Literal["reuse", "flag"] = "reuse",
+                 max_flagged: int = 1000):
+        if hash_method not in HASH_FUNCTIONS:
+            raise ValueError(f"Unsupported hash method: {hash_method}")
+        if on_match not in ("reuse", "flag"):
+            raise ValueError(f"Unsupported on_match action: {on_match}")
+        self.max_distance = max_distance
+        self.hash_method = hash_method
+        self.on_match = on_match
+        self._hash = HASH_FUNCTIONS[hash_method]
+        self._tables: Dict[Optional[str], MultiIndexHash] = {}
+        self.flagged: Deque[Tuple[str, DuplicateMatch]] = deque(maxlen=max_flagged)
+        self._lock = threading.Lock()
+
+    def hash_image(self, gray: np.ndarray) -> int:
+        return self._hash(gray)
+
+    def add(self, image_hash: int, result: Any, key: Optional[str] = None, doc_type: Optional[str] = None) -> None:
+        with self._lock:
+            table = self._tables.get(doc_type)
+            if table is None:
+                table = self._tables[doc_type] = MultiIndexHash(self.max_distance)
+            table.add(image_hash, (key, result))
+
+    def find(self, image_hash: int, doc_type: Optional[str] = None) -> Optional[DuplicateMatch]:
+        """Closest stored image of the same doc type within max_distance, if any"""
+        with self._lock:
+            table = self._tables.get(doc_type)
+            matches = table.search(image_hash, self.max_distance) if table is not None else []
+        if not matches:
+            return None
+        distance, stored_hash, (key, result) = matches[0]
+        return DuplicateMatch(key=key, distance=distance, image_hash=stored_hash, result=result, doc_type=doc_type)
+
+    def flag(self, key: str, match: DuplicateMatch) -> None:
+        """Record an upload that was extracted although it matched a stored image"""
+        logger.info("%s is a near-duplicate of %s (distance %d)", key, match.key, match.distance)
+        with self._lock:
+            self.flagged.append((key, match))
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self._tables.values())
@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Tuple
+
+
+class MultiIndexHash:
+    """
+    Multi-index hashing over fixed-width integer hashes with Hamming distance.
+
+    Each hash is split into max_distance + 1 disjoint bands. Two hashes within
+    max_distance bits of each other differ in at most max_distance bands, so
+    at least one band matches exactly: a query looks up its own band values in
+    per-band buckets and only verifies the candidates found there. Lookups cost
+    a few dict probes plus the bucket sizes, instead of a scan of the index.
+    """
+
+    def __init__(self, max_distance: int, bits: int = 64):
+        if not 0 <= max_distance < bits:
+            raise ValueError(f"max_distance must be between 0 and {bits - 1}")
+        self.max_distance = max_distance
+        self.bits = bits
+        bands = max_distance + 1
+        # (shift, mask) per band; widths differ by at most one bit
+        self._bands: List[Tuple[int, int]] = []
+        start = 0
+        for band in range(bands):
+            width = bits // bands + (band < bits % bands)
+            self._bands.append((start, (1 << width) - 1))
+            start += width
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+        self._values: Dict[int, Any] = {}
+
+    def add(self, item: int, value: Any = None) -> None:
+        if item in self._values:
+            self._values[item] = value  # Same hash, keep the newest value
+            return
+        self._values[item] = value
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            buckets.setdefault((item >> shift) & mask, []).append(item)
+
+    def search(self, item: int, radius: int) -> List[Tuple[int, int, Any]]:
+        """All (distance, hash, value) entries within radius, closest first"""
+        if radius > self.max_distance:
+            raise ValueError(f"radius {radius} exceeds the indexed max_distance {self.max_distance}")
+        found: Dict[int, int] = {}
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            for candidate in buckets.get((item >> shift) & mask, ()):
+                distance = (item ^ candidate).bit_count()
+                # A hash matching in several bands is found once per band
+                if distance <= radius:
+                    found[candidate] = distance
+        matches = [(distance, candidate, self._values[candidate]) for candidate, distance in found.items()]
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -0,0 +1,49 @@
+from functools import lru_cache
+import numpy as np
+
+# cv2 is imported inside the functions, matching processors.base, so importing
+# this module stays cheap
+
+
+@lru_cache(maxsize=None)
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so dct2(x) == C @ x @ C.T"""
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix[0] *= 1 / np.sqrt(2)
+    return matrix * np.sqrt(2 / size)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def dhash(gray: np.ndarray, hash_size: int = 8) -> int:
+    """Difference hash: sign of horizontal gradients on a (hash_size+1) x hash_size thumbnail"""
+    import cv2
+
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def phash(gray: np.ndarray, hash_size: int = 8, highfreq_factor: int = 4) -> int:
+    """DCT hash: low frequency coefficients of a 32x32 thumbnail compared with their median"""
+    import cv2
+
+    size = hash_size * highfreq_factor
+    small = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    basis = _dct_matrix(size)
+    low = (basis @ small @ basis.T)[:hash_size, :hash_size]
+    # Exclude the DC term from the median so overall brightness does not matter
+    median = np.median(low.ravel()[1:])
+    return _bits_to_int(low > median)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+HASH_FUNCTIONS = {
+    "phash": phash,
+    "dhash": dhash,
+}
@@ -1,10 +1,15 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional, Union
 import asyncio
 import json
+import threading
 from datetime import date, datetime
-from main import DocumentProcessor
+from config.base import BaseConfig
+from processors.registry import create_processor
+from serialization import dump_json
+from processors.deadline import Deadline
 
 class CustomJSONEncoder(json.JSONEncoder):
+    """Kept for callers that still pass it to json.dumps; the extractor uses serialization.dump_json"""
     def default(self, obj):
         if isinstance(obj, (date, datetime)):
             return obj.isoformat()
@@ -12,22 +17,65 @@ class CustomJSONEncoder(json.JSONEncoder):
 
 class DocumentExtractor:
     """
-    Main interface for document information extraction
+    Main interface for document information extraction.
+
+    Processors are built once per doc type and keep their provider's HTTP
+    connection pool, which is bound to the event loop it was first used on.
+    The sync methods therefore run on one event loop owned by the extractor
+    (released by close() or a with block); use either the sync or the async
+    methods with a given extractor, not both.
     """
     def __init__(self, 
                  api_key: str,
                  model_type: str = "openai",
                  model_name: str = "gpt-4"):
-        self.processor = DocumentProcessor(
+        self.config = BaseConfig(
             api_key=api_key,
             model_type=model_type,
             model_name=model_name
         )
+        self.processors: Dict[str, Any] = {}
+        self._runner: Optional[asyncio.Runner] = None
+        self._runner_lock = threading.Lock()
+
+    def __enter__(self) -> "DocumentExtractor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the event loop used by the sync methods, and the connections opened on it"""
+        with self._runner_lock:
+            if self._runner is not None:
+                self._runner.close()
+                self._runner = None
+                # Their HTTP clients belonged to the closed loop
+                self.processors.clear()
+
+    def _run(self, coro) -> Any:
+        """Run coro on the extractor's own event loop, kept open between sync calls"""
+        with self._runner_lock:
+            if self._runner is None:
+                self._runner = asyncio.Runner()
+            return self._runner.run(coro)
+
+    def get_processor(self, doc_type: str) -> Any:
+        """Processor for doc_type, built on first use and reused for later documents"""
+        processor = self.processors.get(doc_type)
+        if processor is None:
+            processor = self.processors[doc_type] = create_processor(doc_type, self.config)
+        return processor
+
+    async def _extract(self, file_path: str, doc_type: str, timeout: Optional[float]) -> Any:
+        deadline = Deadline.after(timeout)
+        return await deadline.wait_for(self.get_processor(doc_type).process(file_path, deadline=deadline))
 
     def extract(self, 
                 file_path: str, 
                 doc_type: str,
-                as_json: bool = True) -> Dict[str, Any]:
+                as_json: bool = True,
+                timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Extract information from a document.
         
@@ -35,20 +83,22 @@ class DocumentExtractor:
             file_path (str): Path to the document file
             doc_type (str): Type of document ('form16', 'aadhaar_front', 'aadhaar_back', 'pan')
             as_json (bool): Whether to return result as JSON string (default: True)
+            timeout (float): Seconds before the extraction is cancelled with DeadlineExceeded
             
         Returns:
             Dict[str, Any] or str: Extracted information as dictionary or JSON string
         """
-        result = asyncio.run(self.processor.process(file_path, doc_type))
+        result = self._run(self._extract(file_path, doc_type, timeout))
         
         if as_json:
-            return json.dumps(result, cls=CustomJSONEncoder)
+            return dump_json(result)
         return result
 
     async def extract_async(self, 
                           file_path: str, 
                           doc_type: str,
-                          as_json: bool = True) -> Dict[str, Any]:
+                          as_json: bool = True,
+                          timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Extract information from a document asynchronously.
         
@@ -56,12 +106,34 @@ class DocumentExtractor:
             file_path (str): Path to the document file
             doc_type (str): Type of document ('form16', 'aadhaar_front', 'aadhaar_back', 'pan')
             as_json (bool): Whether to return result as JSON string (default: True)
+            timeout (float): Seconds before the extraction is cancelled with DeadlineExceeded
             
         Returns:
             Dict[str, Any] or str: Extracted information as dictionary or JSON string
         """
-        result = await self.processor.process(file_path, doc_type)
+        result = await self._extract(file_path, doc_type, timeout)
         
         if as_json:
-            return json.dumps(result, cls=CustomJSONEncoder)
-        return result 
\ No newline at end of file
+            return dump_json(result)
+        return result
+
+    async def extract_stream_async(self,
+                                   file_path: str,
+                                   doc_type: str,
+                                   as_json: bool = True,
+                                   timeout: Optional[float] = None) -> AsyncIterator[Union[Any, str]]:
+        """
+        Extract information from a document, yielding partial results as the model streams.
+        
+        Args:
+            file_path (str): Path to the document file
+            doc_type (str): Type of document ('form16', 'aadhaar_front', 'aadhaar_back', 'pan')
+            as_json (bool): Whether to yield results as JSON strings (default: True)
+            timeout (float): Seconds before the extraction is cancelled with DeadlineExceeded
+            
+        Yields:
+            BaseModel or str: Validated partial output, the last one being complete
+        """
+        processor = self.get_processor(doc_type)
+        async for partial in processor.process_stream(file_path, deadline=Deadline.after(timeout)):
+            yield dump_json(partial) if as_json else partial
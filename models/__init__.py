@@ -1,5 +1,13 @@
+from config.lazy import lazy_getattr
 from .base import BaseAIModel
-from .openai_model import OpenAIModel
-from .anthropic_model import AnthropicModel
 
-__all__ = ['BaseAIModel', 'OpenAIModel', 'AnthropicModel']
\ No newline at end of file
+# Provider modules import their SDKs, so they are only loaded when accessed
+_LAZY_IMPORTS = {
+    'OpenAIModel': '.openai_model',
+    'AnthropicModel': '.anthropic_model',
+    'FakeModel': '.fake_model',
+}
+
+__getattr__ = lazy_getattr(__name__, globals(), _LAZY_IMPORTS)
+
+__all__ = ['BaseAIModel', 'OpenAIModel', 'AnthropicModel', 'FakeModel']
\ No newline at end of file
@@ -1,37 +1,44 @@
 from typing import Any, Dict, Type, Optional
 from pydantic import BaseModel
-from anthropic import Anthropic
+from pydantic_ai.models.anthropic import AnthropicModel as PydanticAnthropic
+from pydantic_ai.providers.anthropic import AnthropicProvider
+from pydantic_ai.settings import ModelSettings
 from .base import BaseAIModel
 
-class AnthropicModel(BaseAIModel):
-    def __init__(self, 
+class AnthropicModel(PydanticAnthropic, BaseAIModel):
+    def __init__(self,
                  api_key: str,
                  model_name: str = "claude-3",
                  temperature: float = 0.7,
                  max_tokens: Optional[int] = None,
                  **kwargs):
-        self.client = Anthropic(api_key=api_key)
-        self.model_name = model_name
+        settings = ModelSettings(temperature=temperature)
+        if max_tokens is not None:
+            settings["max_tokens"] = max_tokens
+        super().__init__(
+            model_name,
+            provider=AnthropicProvider(api_key=api_key),
+            settings=settings,
+            **kwargs
+        )
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.additional_params = kwargs
 
-    async def generate(self, 
-                      prompt: str, 
+    async def generate(self,
+                      prompt: str,
                       output_type: Type[BaseModel],
                       **kwargs) -> Any:
-        response = await self.client.messages.create(
-            model=self.model_name,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        # Parse response into output_type
-        return output_type.parse_raw(response.content)
+        from pydantic_ai import Agent
+
+        result = await Agent(self, output_type=output_type).run(prompt, **kwargs)
+        return result.output
 
     def get_model_config(self) -> Dict[str, Any]:
         return {
             "model_type": "anthropic",
             "model_name": self.model_name,
             "temperature": self.temperature
-        } 
\ No newline at end of file
+        }
+
+    def __str__(self) -> str:
+        return self.model_name
@@ -0,0 +1,35 @@
+from typing import Any, Dict, Type
+from pydantic import BaseModel
+from pydantic_ai.models.test import TestModel
+from .base import BaseAIModel
+
+class FakeModel(TestModel, BaseAIModel):
+    """
+    Offline model that returns schema-valid placeholder output without any
+    network calls. Use model_type="test" to run processors or the HTTP
+    service locally.
+    """
+    def __init__(self,
+                 model_name: str = "test",
+                 api_key: str = "",
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.fake_model_name = model_name
+
+    async def generate(self,
+                      prompt: str,
+                      output_type: Type[BaseModel],
+                      **kwargs) -> Any:
+        from pydantic_ai import Agent
+
+        result = await Agent(self, output_type=output_type).run(prompt, **kwargs)
+        return result.output
+
+    def get_model_config(self) -> Dict[str, Any]:
+        return {
+            "model_type": "test",
+            "model_name": self.fake_model_name
+        }
+
+    def __str__(self) -> str:
+        return self.fake_model_name
\ No newline at end of file
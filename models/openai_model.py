@@ -1,28 +1,32 @@
 from typing import Any, Dict, Type, Optional
 from pydantic import BaseModel
-from pydantic_ai.models.openai import OpenAIModel as PydanticOpenAI
+from pydantic_ai.models.openai import OpenAIChatModel
+from pydantic_ai.providers.openai import OpenAIProvider
 from .base import BaseAIModel
 
-class OpenAIModel(PydanticOpenAI, BaseAIModel):
-    def __init__(self, 
+class OpenAIModel(OpenAIChatModel, BaseAIModel):
+    def __init__(self,
                  model_name: str,
                  api_key: str,
                 #  max_tokens: Optional[int] = None,
                 #  temperature: float = 0.7,
                  **kwargs):
         super().__init__(
-            model_name=model_name,
-            api_key=api_key,
+            model_name,
+            provider=OpenAIProvider(api_key=api_key),
             # max_tokens=max_tokens,
             # temperature=temperature,
             **kwargs
         )
 
-    async def generate(self, 
-                      prompt: str, 
+    async def generate(self,
+                      prompt: str,
                       output_type: Type[BaseModel],
                       **kwargs) -> Any:
-        return await super().generate(prompt, output_type, **kwargs)
+        from pydantic_ai import Agent
+
+        result = await Agent(self, output_type=output_type).run(prompt, **kwargs)
+        return result.output
 
     def get_model_config(self) -> Dict[str, Any]:
         return {
@@ -31,4 +35,4 @@ class OpenAIModel(PydanticOpenAI, BaseAIModel):
         }
 
     def __str__(self) -> str:
-        return self.model_name 
\ No newline at end of file
+        return self.model_name
@@ -1,6 +1,15 @@
-from .aadhaar import AadhaarFrontProcessor, AadhaarBackProcessor
-from .pan import PANProcessor
-from .form16 import Form16Processor
-from .base import DocumentProcessor
+from config.lazy import lazy_getattr
+
+# Processors are imported on first access so that e.g. the PAN path does not
+# load the Form 16 schemas
+_LAZY_IMPORTS = {
+    'AadhaarFrontProcessor': '.aadhaar',
+    'AadhaarBackProcessor': '.aadhaar',
+    'PANProcessor': '.pan',
+    'Form16Processor': '.form16',
+    'DocumentProcessor': '.base',
+}
+
+__getattr__ = lazy_getattr(__name__, globals(), _LAZY_IMPORTS)
 
 __all__ = ['AadhaarFrontProcessor', 'AadhaarBackProcessor', 'PANProcessor', 'Form16Processor', 'DocumentProcessor']
\ No newline at end of file
@@ -1,5 +1,7 @@
+import logging
 from agent.factory import AIAgentFactory
-from processors.base import DocumentProcessor
+from processors.base import DocumentPrompt, DocumentProcessor
+from processors.deadline import Deadline
 from pydantic import ConfigDict
 from dependencies.manager import DependencyConfig
 from datetime import date
@@ -7,9 +9,13 @@ from typing import Type
 from pydantic import BaseModel
 from processors.data_classes.aadhaar_front_dataclass import AadhaarFrontOutput
 from processors.data_classes.aadhaar_back_dataclass import AadhaarBackOutput
-from config.base import BaseConfig, AgentDependencies
+from config.base import BaseConfig
+
+logger = logging.getLogger(__name__)
 
 class AadhaarFrontProcessor(DocumentProcessor[AadhaarFrontOutput]):
+    doc_type = "aadhaar_front"
+
     def __init__(self, agent_factory: AIAgentFactory, config: BaseConfig):
         # Define dependencies but make them all optional
         config.dependencies = {}  # No required dependencies for Aadhaar front
@@ -24,20 +30,9 @@ class AadhaarFrontProcessor(DocumentProcessor[AadhaarFrontOutput]):
         return """You are a specialized Aadhaar card front parser. Your task is to extract information 
         from Aadhaar card front images and structure it according to the specified format..."""
 
-    async def process(self, file_path: str, **dependencies) -> AadhaarFrontOutput:
-        validated_deps = self.dependency_manager.validate_dependencies(dependencies)
-        
-        # Store file path
-        self.file_path = file_path
-        
-        # Process image
-        content = await self._process_image(file_path)
-        extracted_text = str(content)
-        
-        prompt = f"""Please extract and structure the following Aadhaar card front text.
-        
-        Document Text:
-        {extracted_text}
+    @property
+    def prompt_instructions(self) -> str:
+        return """Please extract and structure the Aadhaar card front text given below.
         
         Please extract all required information and format it according to the specified structure, including:
         - Name
@@ -46,16 +41,11 @@ class AadhaarFrontProcessor(DocumentProcessor[AadhaarFrontOutput]):
         - Address
         - Aadhaar Number
         - Pincode
-        if fields not found, return None
-        """
-        
-        result = await self.agent.run(
-            prompt,
-            deps=AgentDependencies(file_path=file_path, additional_context=validated_deps),
-            result_type=AadhaarFrontOutput
-        )
-        
-        return result.data
+        if fields not found, return None"""
+
+    async def _build_prompt(self, file_path: str, deadline: Deadline) -> DocumentPrompt:
+        # Process image
+        return await self._image_prompt(file_path, deadline)
 
     def validate(self, data: AadhaarFrontOutput) -> bool:
         try:
@@ -76,10 +66,12 @@ class AadhaarFrontProcessor(DocumentProcessor[AadhaarFrontOutput]):
             return True
             
         except Exception as e:
-            print(f"Validation error: {str(e)}")
+            logger.debug("%s validation error: %s", self.doc_type, e)
             return False
 
 class AadhaarBackProcessor(DocumentProcessor[AadhaarBackOutput]):
+    doc_type = "aadhaar_back"
+
     def __init__(self, agent_factory: AIAgentFactory, config: BaseConfig):
         # Define dependencies but make them all optional
         config.dependencies = {}  # No required dependencies for Aadhaar back
@@ -99,35 +91,19 @@ class AadhaarBackProcessor(DocumentProcessor[AadhaarBackOutput]):
         
         Ensure all extracted information is accurate and properly formatted. if fields not found, return None"""
 
-    async def process(self, file_path: str, **dependencies) -> AadhaarBackOutput:
-        validated_deps = self.dependency_manager.validate_dependencies(dependencies)
-        
-        # Store file path
-        self.file_path = file_path
-        
-        # Process image
-        content = await self._process_image(file_path)
-        extracted_text = str(content)
-        
-        prompt = f"""Please extract and structure the following Aadhaar back text.
-        
-        Document Text:
-        {extracted_text}
+    @property
+    def prompt_instructions(self) -> str:
+        return """Please extract and structure the Aadhaar back text given below.
         
         Please extract all required information and format it according to the specified structure, including:
         - Aadhaar number (12 digits)
         - Complete address
         - Pincode (6 digits)
-        - VID number
-        """
-        
-        result = await self.agent.run(
-            prompt,
-            deps=AgentDependencies(file_path=file_path, additional_context=validated_deps),
-            result_type=AadhaarBackOutput
-        )
-        
-        return result.data
+        - VID number"""
+
+    async def _build_prompt(self, file_path: str, deadline: Deadline) -> DocumentPrompt:
+        # Process image
+        return await self._image_prompt(file_path, deadline)
 
     def validate(self, data: AadhaarBackOutput) -> bool:
         try:
@@ -150,5 +126,5 @@ class AadhaarBackProcessor(DocumentProcessor[AadhaarBackOutput]):
             return True
             
         except Exception as e:
-            print(f"Validation error: {str(e)}")
-            return False
\ No newline at end of file
+            logger.debug("%s validation error: %s", self.doc_type, e)
+            return False
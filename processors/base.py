@@ -1,82 +1,302 @@
+import asyncio
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Dict, Any, Type, List, Union
-from pydantic import BaseModel
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeVar, Generic, Dict, Any, AsyncIterator, Iterable, Iterator, Type, List, Optional, Tuple, Union
+from pydantic import BaseModel, ValidationError
 from agent.factory import AIAgentFactory
+from agent.replay import ReplayMiss
+from agent.cascade import CascadeStats, cascade_stats
+from agent.prompt_cache import PromptCacheStats, prompt_cache_stats
 from dependencies.manager import DependencyManager
 from config.base import AgentDependencies, BaseConfig
-from PyPDF2 import PdfReader
-from PIL import Image
-import numpy as np
-import cv2
-import pytesseract
+from processors.pdf import iter_pdf_chunks
+from processors.ocr import tesseract_to_string
+from processors.document import InMemoryDocument
+from processors.chunking import chunk_token_budget, largest_token_counter
+from processors.deadline import Deadline, DeadlineExceeded
+from agent.router import ModelRouter
+# PyPDF2, cv2 and pytesseract are imported inside the methods that use them so
+# importing a processor does not pay for the OCR/PDF stack until it is needed
 
+if TYPE_CHECKING:
+    import numpy as np
+    from dedup.index import DuplicateMatch
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T', bound=BaseModel)
 
+
+def _cascade_errors() -> Tuple[Type[BaseException], ...]:
+    """Cheap-model failures that escalate to the configured model instead of failing the document"""
+    from pydantic_ai.exceptions import AgentRunError  # HTTP errors, unusable output, usage limits
+
+    return (AgentRunError, ValidationError, ReplayMiss)
+
+
+@dataclass
+class DocumentPrompt:
+    """
+    User prompts for one document: a single prompt, or one per chunk when
+    chunks are sized to the model context window. Images also carry their
+    perceptual hash and any near-duplicate found for it, so the match travels
+    with the request instead of being kept on the (shared) processor.
+    """
+    texts: List[str]
+    image_hash: Optional[int] = None
+    duplicate: Optional["DuplicateMatch"] = None
+
+
 class DocumentProcessor(ABC, Generic[T]):
     """Abstract base class for document processors"""
+
+    doc_type: Optional[str] = None  # Key used for model routing, e.g. "pan"
     
     def __init__(self, agent_factory: AIAgentFactory, config: BaseConfig):
         self.agent = agent_factory.create_agent(
             config=config,
             output_type=self.output_type,
-            system_prompt=self.system_prompt
+            system_prompt=self.agent_system_prompt,
+            doc_type=self.doc_type
         )
+        self.cascade_agent = agent_factory.create_cascade_agent(
+            config=config,
+            output_type=self.output_type,
+            system_prompt=self.agent_system_prompt,
+            doc_type=self.doc_type
+        )
+        self.cascade_stats: CascadeStats = cascade_stats
+        self.prompt_cache_stats: PromptCacheStats = prompt_cache_stats
         self.dependency_manager = DependencyManager(config.dependencies)
         self.chunk_size = config.chunk_size or 4000  # Default chunk size
-        self.file_path = None  # Initialize file_path
+        self.chunk_length = len
+        self.chunk_by_tokens = config.chunk_by_tokens
+        if config.chunk_by_tokens:
+            # Size chunks to fit every model a chunk can be sent to: the one this doc
+            # type is routed to, plus the cascade and hedge models when configured.
+            # context_window overrides the routed model's window only
+            windows = {ModelRouter.config_for(config, self.doc_type).model_name: config.context_window}
+            for route in (config.cascade_model, config.hedge_model):
+                if route is not None:
+                    windows.setdefault(route.model_name, None)
+            self.chunk_length = largest_token_counter(windows)
+            self.chunk_size = min(
+                chunk_token_budget(
+                    model_name,
+                    system_prompt=self.agent_system_prompt,
+                    output_type=self.output_type,
+                    reserved_output_tokens=config.reserved_output_tokens,
+                    context_window=context_window
+                )
+                for model_name, context_window in windows.items()
+            )
+        self.max_concurrent_chunks = config.max_concurrent_chunks
+        self.pdf_window_pages = config.pdf_window_pages
+        self.max_document_bytes = config.max_document_bytes
+        self.duplicate_index = config.duplicate_index
+        self.request_timeout = config.request_timeout
+        self.stage_timeouts = dict(config.stage_timeouts)
+        # Per-document state (file path, deadline, image hash) is passed between
+        # methods rather than stored, so one processor can serve concurrent requests
     
-    @abstractmethod
-    async def process(self, file_path: str, **dependencies) -> T:
+    async def process(self, file_path: str, deadline: Optional[Deadline] = None, **dependencies) -> T:
         """Process the document and return structured data"""
-        self.file_path = file_path  # Store file_path
         validated_deps = self.dependency_manager.validate_dependencies(dependencies)
-        
-        file_type = self._get_file_type(file_path)
-        if file_type == "pdf":
-            content = await self._process_pdf(file_path)
-        elif file_type in ["jpg", "jpeg", "png"]:
-            content = await self._process_image(file_path)
-        else:
-            raise ValueError(f"Unsupported file type: {file_type}")
-            
-        return await self._process_content(content, validated_deps)
+        deadline = self._start_deadline(deadline)
+
+        prompt = await self._build_prompt(file_path, deadline)
+        return await self._run_agent(
+            prompt,
+            deps=AgentDependencies(file_path=file_path, additional_context=validated_deps),
+            deadline=deadline
+        )
+
+    async def process_stream(self,
+                             file_path: str,
+                             deadline: Optional[Deadline] = None,
+                             **dependencies) -> AsyncIterator[T]:
+        """
+        Process the document and yield validated partial outputs as the model
+        streams its response. The last item yielded is the complete result.
+        The model stage deadline bounds the whole stream, including waits for
+        the first and each following chunk.
+        """
+        validated_deps = self.dependency_manager.validate_dependencies(dependencies)
+        deadline = self._start_deadline(deadline)
+
+        prompt = await self._build_prompt(file_path, deadline)
+        if self._reusable(prompt.duplicate):
+            yield prompt.duplicate.result
+            return
+
+        model_deadline = deadline.stage("model")
+        deps = AgentDependencies(file_path=file_path, additional_context=validated_deps)
+        completed: List[T] = []
+        merged = None
+        # Chunks are streamed one after another; each partial is yielded merged
+        # with the outputs of the chunks already completed
+        # The timeout aborts a stream that stalls before its first chunk or between
+        # chunks; it is paused while a partial result is with the caller
+        closed = False
+        async with model_deadline.timeout() as timeout:
+            for text in prompt.texts:
+                started = time.perf_counter()
+                first_token = None
+                partial = None
+                async with self.agent.run_stream(text, deps=deps, output_type=self.output_type) as result, \
+                        aclosing(result.stream_output()) as partials:
+                    async for partial in partials:
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+                        merged = self._merge_results(completed + [partial]) if completed else partial
+                        try:
+                            with timeout.paused():
+                                yield merged
+                        except GeneratorExit:
+                            # The caller stopped early. pydantic-ai's streamed run cannot be
+                            # unwound by GeneratorExit, so leave its context normally instead
+                            closed = True
+                            break
+                    self._record_usage(result, first_token, streamed=True)
+                if closed:
+                    return
+                if partial is not None:
+                    completed.append(partial)
+        if merged is not None:
+            self._remember(prompt, merged, file_path)
+
+    def _start_deadline(self, deadline: Optional[Deadline]) -> Deadline:
+        """Use the caller's deadline, or start one from config.request_timeout"""
+        if deadline is None:
+            return Deadline.after(self.request_timeout, self.stage_timeouts)
+        if not deadline.stage_timeouts:
+            return Deadline(deadline.expires_at, self.stage_timeouts, name=deadline.name)
+        return deadline
+
+    @abstractmethod
+    async def _build_prompt(self, file_path: str, deadline: Deadline) -> DocumentPrompt:
+        """Extract the document text and build the user prompt"""
+        pass
+
+    @property
+    @abstractmethod
+    def prompt_instructions(self) -> str:
+        """Static extraction instructions, sent in the system prompt after system_prompt"""
+        pass
+
+    @property
+    def agent_system_prompt(self) -> str:
+        """
+        System prompt the agents are built with: system_prompt followed by the
+        extraction instructions. Everything static sits ahead of the provider's
+        cache breakpoints, so only the document text differs between requests.
+        """
+        return f"{self.system_prompt}\n\n{self.prompt_instructions}"
+
+    def _document_prompt(self, text_parts: Iterable[str]) -> str:
+        """User prompt: the document text alone, the instructions are in the system prompt"""
+        return self._join_prompt("Document Text:\n", text_parts, "")
+
+    async def _pdf_prompt(self, file_path: str, deadline: Deadline) -> DocumentPrompt:
+        """
+        Prompt for a PDF. Parsing runs in a worker thread, so the event loop
+        stays responsive. With chunk_by_tokens each chunk fills one model call
+        and gets its own prompt; otherwise chunks are streamed straight into a
+        single prompt so the document text is only copied once.
+        """
+        chunks = self._iter_pdf_chunks(file_path, deadline)
+        if self.chunk_by_tokens:
+            texts = await asyncio.to_thread(lambda: [self._document_prompt([chunk]) for chunk in chunks])
+            return DocumentPrompt(texts)
+        return DocumentPrompt([await asyncio.to_thread(self._document_prompt, chunks)])
+
+    def _iter_pdf_chunks(self, file_path: str, deadline: Deadline) -> Iterator[str]:
+        """Lazily extract PDF text chunks, honouring the page window and byte budget"""
+        return iter_pdf_chunks(
+            file_path,
+            chunk_size=self.chunk_size,
+            window_pages=self.pdf_window_pages,
+            max_bytes=self.max_document_bytes,
+            length=self.chunk_length,
+            split_pages=self.chunk_by_tokens,
+            deadline=deadline.stage("pdf")
+        )
+
+    @staticmethod
+    def _join_prompt(header: str, text_parts: Iterable[str], footer: str, separator: str = "\n") -> str:
+        """Build header + joined document text + footer with a single copy of the text"""
+        parts = [header]
+        for index, part in enumerate(text_parts):
+            if index:
+                parts.append(separator)
+            parts.append(part)
+        parts.append(footer)
+        return "".join(parts)
+
+    async def _image_prompt(self, file_path: str, deadline: Deadline) -> DocumentPrompt:
+        """
+        Prompt for a card image. With a duplicate index configured the image is
+        looked up first, and OCR is skipped when a stored extraction will be reused.
+        """
+        # Decoding, hashing and the index lookup are CPU bound; a worker thread
+        # keeps them from stalling other requests on the event loop
+        gray, image_hash, duplicate = await asyncio.to_thread(self._load_and_lookup, file_path)
+        if self._reusable(duplicate):
+            return DocumentPrompt([], image_hash, duplicate)
+
+        text = await self._process_image(gray, deadline)
+        return DocumentPrompt([self._document_prompt([text])], image_hash, duplicate)
+
+    def _load_and_lookup(self, file_path: str) -> Tuple["np.ndarray", Optional[int], Optional["DuplicateMatch"]]:
+        """Grayscale image, its perceptual hash and closest stored near-duplicate, if an index is configured"""
+        gray = self._load_grayscale(file_path)
+        if self.duplicate_index is None:
+            return gray, None, None
+        image_hash = self.duplicate_index.hash_image(gray)
+        return gray, image_hash, self.duplicate_index.find(image_hash, doc_type=self.doc_type)
+
+    def _load_grayscale(self, file_path: str) -> "np.ndarray":
+        import cv2
 
-    async def _process_pdf(self, file_path: str) -> List[str]:
-        """Extract text from PDF in chunks"""
-        reader = PdfReader(file_path)
-        chunks = []
-        current_chunk = ""
-        
-        for page in reader.pages:
-            text = page.extract_text()
-            if len(current_chunk) + len(text) > self.chunk_size:
-                chunks.append(current_chunk)
-                current_chunk = text
-            else:
-                current_chunk += text
-                
-        if current_chunk:
-            chunks.append(current_chunk)
-        return chunks
-
-    async def _process_image(self, file_path: str) -> str:
-        """Process image using OCR"""
         # Read image using OpenCV
         # Install OpenCV using: pip install opencv-python
-        image = cv2.imread(file_path)
+        if isinstance(file_path, InMemoryDocument):
+            import numpy as np
+            image = cv2.imdecode(np.frombuffer(file_path.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        else:
+            image = cv2.imread(file_path)
         if image is None:
             raise ValueError(f"Failed to load image: {file_path}")
             
         # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    async def _process_image(self, gray: "np.ndarray", deadline: Deadline) -> str:
+        """Process image using OCR"""
+        import cv2
+        import pytesseract
+
+        ocr_deadline = deadline.stage("ocr")
+        ocr_deadline.check()
         
         # Apply thresholding to preprocess the image
         threshold = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
-        
-        # Perform OCR using Tesseract
+        ok, png = cv2.imencode(".png", threshold)
+        if not ok:
+            raise RuntimeError("OCR failed: could not encode the thresholded image")
+
+        # Perform OCR using Tesseract. The subprocess is awaited on the event loop and
+        # killed when the OCR deadline passes or the request is cancelled; the
+        # executable is the one configured for pytesseract
         try:
-            text = pytesseract.image_to_string(threshold)
+            text = await ocr_deadline.wait_for(
+                tesseract_to_string(png.tobytes(), pytesseract.pytesseract.tesseract_cmd)
+            )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             raise RuntimeError(f"OCR failed: {str(e)}")
             
@@ -85,36 +305,100 @@ class DocumentProcessor(ABC, Generic[T]):
             
         return text.strip()
 
-    async def _process_content(self, content: Union[List[str], str], dependencies: Dict[str, Any]) -> T:
-        """Process extracted content using AI agent"""
-        if isinstance(content, list):
-            # Process chunks
-            results = []
-            for chunk in content:
-                result = await self.agent.run(
-                    chunk,
-                    deps=AgentDependencies(file_path=self.file_path, additional_context=dependencies)
-                )
-                results.append(result)
-            # Merge results
-            return self._merge_results(results)
-        else:
-            # Process single content
-            # Ensure content is a string
-            content_str = str(content) if content is not None else ""
-            return await self.agent.run(
-                content_str,
-                deps=AgentDependencies(file_path=self.file_path, additional_context=dependencies)
-            )
+    async def _run_agent(self, prompt: DocumentPrompt, deps: AgentDependencies, deadline: Deadline) -> T:
+        """
+        Run the prompt through the agent and return the structured data.
+        Near-duplicates of a previously extracted image reuse that result when
+        the duplicate index is configured to do so.
+        """
+        if self._reusable(prompt.duplicate):
+            return prompt.duplicate.result
+
+        data = await self._extract(prompt.texts, deps, deadline.stage("model"))
+        self._remember(prompt, data, deps.file_path)
+        return data
+
+    def _reusable(self, match: Optional["DuplicateMatch"]) -> bool:
+        """Whether a near-duplicate's stored extraction can be returned for this doc type"""
+        return (match is not None
+                and self.duplicate_index.on_match == "reuse"
+                and isinstance(match.result, self.output_type))
+
+    def _remember(self, prompt: DocumentPrompt, data: T, file_path: str) -> None:
+        """Add a newly extracted image to the duplicate index, flagging it if it matched one"""
+        if prompt.image_hash is None:
+            return
+        # Only the name is stored; keeping the document would pin uploaded bytes in memory
+        key = str(file_path)
+        if prompt.duplicate is not None:
+            self.duplicate_index.flag(key, prompt.duplicate)
+        self.duplicate_index.add(prompt.image_hash, data, key=key, doc_type=self.doc_type)
+
+    async def _extract(self, prompts: List[str], deps: AgentDependencies, model_deadline: Deadline) -> T:
+        """
+        With a cascade model configured, the cheap model answers first and the
+        configured model is only used when its (merged) output fails validate().
+        Model calls are cancelled, aborting the HTTP request, when the model
+        stage deadline passes.
+        """
+        if self.cascade_agent is None:
+            return await self._extract_with(self.agent, prompts, deps, model_deadline)
+
+        try:
+            data = await self._extract_with(self.cascade_agent, prompts, deps, model_deadline)
+            if self.validate(data):
+                self.cascade_stats.record(self.doc_type or type(self).__name__, escalated=False)
+                return data
+            logger.debug("Cascade output for %s failed validation, escalating", self.doc_type)
+        except _cascade_errors() as e:
+            logger.warning("Cascade model failed for %s, escalating: %s", self.doc_type, e)
+
+        self.cascade_stats.record(self.doc_type or type(self).__name__, escalated=True)
+        return await self._extract_with(self.agent, prompts, deps, model_deadline)
+
+    async def _extract_with(self,
+                            agent: Any,
+                            prompts: List[str],
+                            deps: AgentDependencies,
+                            model_deadline: Deadline) -> T:
+        """One model call per prompt, at most max_concurrent_chunks at a time, merged in chunk order"""
+        if len(prompts) == 1:
+            result = await self._call_agent(agent, prompts[0], deps, model_deadline)
+            return result.output
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_chunks)
+
+        async def call(prompt: str) -> T:
+            async with semaphore:
+                result = await self._call_agent(agent, prompt, deps, model_deadline)
+                return result.output
+
+        return self._merge_results(list(await asyncio.gather(*(call(prompt) for prompt in prompts))))
+
+    async def _call_agent(self, agent: Any, prompt: str, deps: AgentDependencies, model_deadline: Deadline) -> Any:
+        started = time.perf_counter()
+        result = await model_deadline.wait_for(
+            agent.run(prompt, deps=deps, output_type=self.output_type)
+        )
+        self._record_usage(result, time.perf_counter() - started)
+        return result
+
+    def _record_usage(self, result: Any, seconds: Optional[float], streamed: bool = False) -> None:
+        """Feed token usage into the prompt cache stats; replayed results carry none"""
+        usage = getattr(result, "usage", None)
+        # A method in earlier pydantic-ai releases, a property in later ones
+        if callable(usage) and not hasattr(usage, "input_tokens"):
+            usage = usage()
+        self.prompt_cache_stats.record(self.doc_type or type(self).__name__, usage, seconds, streamed=streamed)
 
     def _merge_results(self, results: List[T]) -> T:
-        """Merge multiple results into single output"""
+        """Merge the outputs of a document's chunks, in chunk order, into a single output"""
         # Implementation will depend on specific output type
         raise NotImplementedError("Merge strategy must be implemented in derived classes")
 
     def _get_file_type(self, file_path: str) -> str:
         """Determine file type from path"""
-        return file_path.split('.')[-1].lower()
+        return str(file_path).split('.')[-1].lower()
 
     @abstractmethod
     def validate(self, data: T) -> bool:
@@ -0,0 +1,129 @@
+import json
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, Optional, Type
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Context windows in tokens, matched on the longest model name prefix
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-4-turbo": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "o1": 200000,
+    "o3": 200000,
+    "o4-mini": 200000,
+    "claude": 200000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Allowance for the message framing and header around the document text in each prompt
+PROMPT_OVERHEAD_TOKENS = 256
+
+TokenCounter = Callable[[str], int]
+
+
+def context_window_for(model_name: str) -> int:
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model_name.startswith(prefix)]
+    if not matches:
+        return DEFAULT_CONTEXT_WINDOW
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+def _estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English/Latin text
+    return math.ceil(len(text) / 4)
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(model_name: str) -> TokenCounter:
+    """Local token counter for model_name: tiktoken when installed, otherwise a character estimate"""
+    try:
+        import tiktoken
+    except ImportError:
+        return _estimate_tokens
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            # Non-OpenAI models: o200k_base is a close enough proxy for budgeting
+            encoding = tiktoken.get_encoding("o200k_base")
+    except OSError as e:
+        # Encodings are downloaded on first use, which fails on offline hosts
+        logger.warning("tiktoken encoding unavailable for %s, estimating tokens: %s", model_name, e)
+        return _estimate_tokens
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def largest_token_counter(model_names: Iterable[str]) -> TokenCounter:
+    """Counter for text sent to any of model_names: the largest count among their tokenizers"""
+    counters = list(dict.fromkeys(get_token_counter(name) for name in model_names))
+    if len(counters) == 1:
+        return counters[0]
+    return lambda text: max(count(text) for count in counters)
+
+
+def chunk_token_budget(model_name: str,
+                       system_prompt: str,
+                       output_type: Type[BaseModel],
+                       reserved_output_tokens: int,
+                       context_window: Optional[int] = None) -> int:
+    """Tokens of document text that fit in one call next to the system prompt, schema and output"""
+    count = get_token_counter(model_name)
+    window = context_window or context_window_for(model_name)
+    schema_tokens = count(json.dumps(output_type.model_json_schema()))
+    budget = window - reserved_output_tokens - count(system_prompt) - schema_tokens - PROMPT_OVERHEAD_TOKENS
+    if budget <= 0:
+        raise ValueError(
+            f"No room for document text in a {window} token context after reserving "
+            f"{reserved_output_tokens} output tokens and {schema_tokens} schema tokens"
+        )
+    return budget
+
+
+_SECTION_BREAKS = [(re.compile(r"\n\s*\n"), "\n\n"), (re.compile(r"\n"), "\n")]
+
+
+def split_oversized(text: str, limit: int, length: TokenCounter) -> Iterator[str]:
+    """
+    Split text longer than limit on section boundaries (blank lines, then lines),
+    hard-splitting only a single line that is still too long.
+    """
+    if length(text) <= limit:
+        yield text
+        return
+
+    for pattern, separator in _SECTION_BREAKS:
+        pieces = pattern.split(text)
+        if len(pieces) == 1:
+            continue
+        # Token counts are summed per piece rather than recounting the growing chunk
+        current, current_len = [], 0
+        for piece in pieces:
+            piece_len = length(piece)
+            if piece_len > limit:
+                if current:
+                    yield separator.join(current)
+                    current, current_len = [], 0
+                yield from split_oversized(piece, limit, length)
+                continue
+            if current and current_len + piece_len > limit:
+                yield separator.join(current)
+                current, current_len = [], 0
+            current.append(piece)
+            current_len += piece_len
+        if current:
+            yield separator.join(current)
+        return
+
+    # A single unbroken line: cut proportionally by characters
+    step = max(1, len(text) * limit // max(length(text), 1))
+    for start in range(0, len(text), step):
+        yield text[start:start + step]
@@ -1,6 +1,12 @@
-from .form_16_dataclass import Form16Output
-from .aadhaar_front_dataclass import AadhaarFrontOutput
-from .aadhaar_back_dataclass import AadhaarBackOutput
-from .pan_dataclass import PANData
+from config.lazy import lazy_getattr
 
-__all__ = ['Form16Output', 'AadhaarFrontOutput', 'AadhaarBackOutput', 'PANData']   
\ No newline at end of file
+_LAZY_IMPORTS = {
+    'Form16Output': '.form_16_dataclass',
+    'AadhaarFrontOutput': '.aadhaar_front_dataclass',
+    'AadhaarBackOutput': '.aadhaar_back_dataclass',
+    'PANData': '.pan_dataclass',
+}
+
+__getattr__ = lazy_getattr(__name__, globals(), _LAZY_IMPORTS)
+
+__all__ = ['Form16Output', 'AadhaarFrontOutput', 'AadhaarBackOutput', 'PANData']
\ No newline at end of file
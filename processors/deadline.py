@@ -0,0 +1,113 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Dict, Iterator, Optional, TypeVar
+
+R = TypeVar('R')
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request or one of its stages runs past its deadline"""
+
+
+class Deadline:
+    """
+    Absolute request deadline on the monotonic clock, propagated through
+    OCR, PDF parsing and model calls. stage() derives a tighter deadline for
+    one stage from the per-stage budgets, never later than the request's.
+    """
+
+    def __init__(self,
+                 expires_at: Optional[float] = None,
+                 stage_timeouts: Optional[Dict[str, float]] = None,
+                 name: str = "request"):
+        self.expires_at = expires_at  # None means no deadline
+        self.stage_timeouts = stage_timeouts or {}
+        self.name = name
+
+    @classmethod
+    def after(cls, timeout: Optional[float], stage_timeouts: Optional[Dict[str, float]] = None) -> "Deadline":
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        return cls(expires_at, stage_timeouts)
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded(f"{self.name} deadline exceeded")
+
+    def call_timeout(self) -> Optional[float]:
+        """
+        Timeout in seconds for a blocking call, None when there is no deadline.
+        Raises instead of returning 0, which many APIs read as "no timeout".
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(f"{self.name} deadline exceeded")
+        return remaining
+
+    def stage(self, name: str) -> "Deadline":
+        """Deadline for a stage starting now, bounded by its budget and by this deadline"""
+        expires_at = self.expires_at
+        budget = self.stage_timeouts.get(name)
+        if budget is not None:
+            stage_expiry = time.monotonic() + budget
+            expires_at = stage_expiry if expires_at is None else min(expires_at, stage_expiry)
+        return Deadline(expires_at, self.stage_timeouts, name=name)
+
+    async def wait_for(self, awaitable: Awaitable[R]) -> R:
+        """Await within the deadline; on expiry the awaitable is cancelled"""
+        self.check()
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"{self.name} deadline exceeded")
+
+    def timeout(self) -> "DeadlineTimeout":
+        """Async context manager that cancels the block it wraps once the deadline passes"""
+        return DeadlineTimeout(self)
+
+
+class DeadlineTimeout:
+    """
+    asyncio.timeout bound to a Deadline, raising DeadlineExceeded on expiry.
+    Code that yields to a consumer from inside the block wraps the yield in
+    paused(), so the consumer is never cancelled and time spent outside the
+    block is only checked once control comes back.
+    """
+
+    def __init__(self, deadline: Deadline):
+        self.deadline = deadline
+        self._timeout: Optional[asyncio.Timeout] = None
+
+    def _when(self) -> Optional[float]:
+        remaining = self.deadline.remaining()
+        if remaining is None:
+            return None
+        return asyncio.get_running_loop().time() + remaining
+
+    async def __aenter__(self) -> "DeadlineTimeout":
+        self.deadline.check()
+        self._timeout = asyncio.timeout_at(self._when())
+        await self._timeout.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> Optional[bool]:
+        try:
+            return await self._timeout.__aexit__(exc_type, exc, tb)
+        except TimeoutError:
+            raise DeadlineExceeded(f"{self.deadline.name} deadline exceeded") from None
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        self._timeout.reschedule(None)
+        yield
+        # Not reached when the consumer closes the stream early
+        self.deadline.check()
+        self._timeout.reschedule(self._when())
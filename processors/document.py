@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Union
+
+
+@dataclass
+class InMemoryDocument:
+    """
+    Uploaded document held in memory. Processors accept it anywhere a file
+    path is accepted, so uploads never need to be written to a temp file.
+    """
+    name: str  # Original file name; its extension selects PDF or image handling
+    data: bytes
+
+    def __str__(self) -> str:
+        return self.name
+
+
+DocumentSource = Union[str, InMemoryDocument]
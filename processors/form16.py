@@ -1,14 +1,20 @@
+import logging
 from typing import List, Type
 from datetime import date
 from pydantic import BaseModel
-from processors.base import DocumentProcessor
+from processors.base import DocumentPrompt, DocumentProcessor
+from processors.deadline import Deadline
+from processors.merge import merge_outputs
 from processors.data_classes.form_16_dataclass import CertificateDetails, DeducteeDetails, DeductorDetails, Form16Output, PaymentSummary, TaxDeductedSummary, TaxDeductionDeposit, TaxDepositDetails, VerificationDetails
-from tools import extract_text_from_file
 from agent.factory import AIAgentFactory
-from config.base import BaseConfig, AgentDependencies, DependencyConfig
+from config.base import BaseConfig, DependencyConfig
+
+logger = logging.getLogger(__name__)
 
 
 class Form16Processor(DocumentProcessor[Form16Output]):
+    doc_type = "form16"
+
     def __init__(self, agent_factory: AIAgentFactory, config: BaseConfig):
         # Get the JSON schema for validation but don't use it for dependencies
         self.output_schema = Form16Output.model_json_schema()
@@ -75,29 +81,9 @@ class Form16Processor(DocumentProcessor[Form16Output]):
         return """You are a specialized Form 16 parser. Your task is to extract information 
         from Form 16 documents and structure it according to the specified format..."""
 
-    async def process(self, file_path: str, **dependencies) -> Form16Output:
-        # Validate any provided dependencies, but don't require them
-        validated_deps = self.dependency_manager.validate_dependencies(dependencies)
-        
-        # Store file path
-        self.file_path = file_path
-        
-        # Get file type and process accordingly
-        file_type = self._get_file_type(file_path)
-        if file_type == "pdf":
-            content = await self._process_pdf(file_path)
-            # Join PDF chunks with newlines
-            extracted_text = "\n".join(content) if isinstance(content, list) else str(content)
-        elif file_type in ["jpg", "jpeg", "png"]:
-            content = await self._process_image(file_path)
-            extracted_text = str(content)
-        else:
-            raise ValueError(f"Unsupported file type: {file_type}")
-        
-        prompt = f"""Please extract and structure the following Form 16 text.
-        
-        Document Text:
-        {extracted_text}
+    @property
+    def prompt_instructions(self) -> str:
+        return """Please extract and structure the Form 16 text given below.
         
         Please extract all required information and format it according to the specified structure, including:
         - Deductor details (employer's information)
@@ -107,70 +93,69 @@ class Form16Processor(DocumentProcessor[Form16Output]):
         - Tax deduction summaries
         - Tax deposit details
         - Verification details
-        - Tax deduction deposits
-        """
-        
-        result = await self.agent.run(
-            prompt,
-            deps=AgentDependencies(file_path=file_path, additional_context=validated_deps),
-            result_type=Form16Output
-        )
-        
-        # Handle pydantic_ai RunResult
-        return result.data
+        - Tax deduction deposits"""
+
+    async def _build_prompt(self, file_path: str, deadline: Deadline) -> DocumentPrompt:
+        # Get file type and process accordingly
+        file_type = self._get_file_type(file_path)
+        if file_type == "pdf":
+            # PDF parsing stops at the next page once the pdf stage deadline has passed
+            return await self._pdf_prompt(file_path, deadline)
+        elif file_type in ["jpg", "jpeg", "png"]:
+            return await self._image_prompt(file_path, deadline)
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
+
+    def _merge_results(self, results: List[Form16Output]) -> Form16Output:
+        # Payment, TDS and deposit tables continue across chunks and are concatenated;
+        # deductor, deductee, certificate and verification details take the first
+        # non-empty value found in page order
+        return merge_outputs(results)
 
     def validate(self, data: Form16Output) -> bool:
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            try:
-                # Check deductor details
-                if not all([data.deductor_details.name, data.deductor_details.address, 
-                           data.deductor_details.pan, data.deductor_details.tan]):
-                    raise ValueError("Missing deductor details")
-
-                # Check deductee details  
-                if not all([data.deductee_details.name, data.deductee_details.address,
-                           data.deductee_details.pan]):
-                    raise ValueError("Missing deductee details")
-
-                # Check certificate details
-                if not all([data.certificate_details.certificate_number,
-                           data.certificate_details.last_updated_date,
-                           data.certificate_details.assessment_year,
-                           data.certificate_details.period.from_date,
-                           data.certificate_details.period.to_date]):
-                    raise ValueError("Missing certificate details")
-
-                # Check payment summaries
-                if not data.summary_of_payment:
-                    raise ValueError("Missing payment summary")
-
-                # Check tax deducted summaries
-                if not data.summary_of_tax_deducted_at_source:
-                    raise ValueError("Missing tax deducted summary")
-
-                # Check tax deposit details
-                if not data.details_of_tax_deposited:
-                    raise ValueError("Missing tax deposit details")
-
-                # Check verification details
-                if not all([data.verification_details.name,
-                           data.verification_details.designation,
-                           data.verification_details.verification_statement,
-                           data.verification_details.place_and_date_of_verification]):
-                    raise ValueError("Missing verification details")
-
-                # Check tax deduction deposits
-                if not data.tax_deposited_in_respect_of_deduction:
-                    raise ValueError("Missing tax deduction deposits")
-
-                return True
-
-            except ValueError as e:
-                print(f"Validation failed on attempt {retry_count + 1}: {str(e)}")
-                retry_count += 1
-                if retry_count == max_retries:
-                    return False
-                continue
\ No newline at end of file
+        try:
+            # Check deductor details
+            if not all([data.deductor_details.name, data.deductor_details.address, 
+                       data.deductor_details.pan, data.deductor_details.tan]):
+                raise ValueError("Missing deductor details")
+
+            # Check deductee details  
+            if not all([data.deductee_details.name, data.deductee_details.address,
+                       data.deductee_details.pan]):
+                raise ValueError("Missing deductee details")
+
+            # Check certificate details
+            if not all([data.certificate_details.certificate_number,
+                       data.certificate_details.last_updated_date,
+                       data.certificate_details.assessment_year,
+                       data.certificate_details.period.from_date,
+                       data.certificate_details.period.to_date]):
+                raise ValueError("Missing certificate details")
+
+            # Check payment summaries
+            if not data.summary_of_payment:
+                raise ValueError("Missing payment summary")
+
+            # Check tax deducted summaries
+            if not data.summary_of_tax_deducted_at_source:
+                raise ValueError("Missing tax deducted summary")
+
+            # Check tax deposit details
+            if not data.details_of_tax_deposited:
+                raise ValueError("Missing tax deposit details")
+
+            # Check verification details
+            if not all([data.verification_details.name,
+                       data.verification_details.designation,
+                       data.verification_details.verification_statement,
+                       data.verification_details.place_and_date_of_verification]):
+                raise ValueError("Missing verification details")
+
+            # Check tax deduction deposits
+            if not data.tax_deposited_in_respect_of_deduction:
+                raise ValueError("Missing tax deduction deposits")
+
+            return True
+        except ValueError as e:
+            logger.debug("%s validation failed: %s", self.doc_type, e)
+            return False
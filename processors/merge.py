@@ -0,0 +1,57 @@
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from pydantic import BaseModel
+
+M = TypeVar('M', bound=BaseModel)
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    if isinstance(value, (list, tuple, dict)):
+        return not value
+    return False
+
+
+def _concat_unique(lists: List[List[Any]]) -> List[Any]:
+    """Concatenate in order, dropping items repeated by overlapping chunks"""
+    merged: List[Any] = []
+    for items in lists:
+        for item in items or []:
+            if item not in merged:
+                merged.append(item)
+    return merged
+
+
+def merge_outputs(results: List[M],
+                  choose: Optional[Dict[str, Callable[[List[Any]], Any]]] = None) -> M:
+    """
+    Merge the outputs extracted from consecutive chunks of one document.
+
+    Lists are concatenated in chunk order with duplicates removed, nested
+    models are merged field by field, and any other field takes the first
+    non-empty value. choose overrides the rule for named top-level fields
+    and receives that field's values from every result.
+    """
+    if not results:
+        raise ValueError("No results to merge")
+    if len(results) == 1:
+        return results[0]
+
+    choose = choose or {}
+    model_type = type(results[0])
+    merged: Dict[str, Any] = {}
+    for name in model_type.model_fields:
+        values = [getattr(result, name, None) for result in results]
+        present = [value for value in values if not _is_empty(value)]
+        if name in choose:
+            merged[name] = choose[name](values)
+        elif isinstance(values[0], list):
+            merged[name] = _concat_unique(values)
+        elif len(present) > 1 and all(isinstance(value, BaseModel) for value in present):
+            merged[name] = merge_outputs(present)
+        else:
+            merged[name] = present[0] if present else values[0]
+    # Values came from validated outputs, so rebuilding them skips validation
+    return model_type.model_construct(**merged)
@@ -0,0 +1,26 @@
+import asyncio
+import subprocess
+
+
+async def tesseract_to_string(image: bytes, tesseract_cmd: str = "tesseract") -> str:
+    """
+    OCR an encoded image (PNG, JPEG, ...) with the tesseract CLI. The subprocess
+    is awaited on the event loop and killed if the caller is cancelled, so a
+    cancelled request or an expired deadline never leaves tesseract running.
+    """
+    process = await asyncio.create_subprocess_exec(
+        tesseract_cmd, "stdin", "stdout",
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await process.communicate(image)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+        raise
+
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(message or f"tesseract exited with status {process.returncode}")
+    return stdout.decode("utf-8", errors="replace")
@@ -1,11 +1,18 @@
-from typing import Type
+import logging
+from typing import List, Type
 from agent.factory import AIAgentFactory
-from config.base import BaseConfig, DependencyConfig, AgentDependencies
-from processors.base import DocumentProcessor
+from config.base import BaseConfig, DependencyConfig
+from processors.base import DocumentPrompt, DocumentProcessor
+from processors.deadline import Deadline
+from processors.merge import merge_outputs
 from processors.data_classes.pan_dataclass import PANData
 
+logger = logging.getLogger(__name__)
+
 
 class PANProcessor(DocumentProcessor[PANData]):
+    doc_type = "pan"
+
     def __init__(self, agent_factory: AIAgentFactory, config: BaseConfig):
         # Get the JSON schema for validation
         self.output_schema = PANData.model_json_schema()
@@ -61,70 +68,54 @@ class PANProcessor(DocumentProcessor[PANData]):
         
         Ensure all extracted information is accurate and properly formatted."""
     
-    async def process(self, file_path: str, **dependencies) -> PANData:
-        # Validate dependencies but don't require them
-        validated_deps = self.dependency_manager.validate_dependencies(dependencies)
-        
-        # Store file path
-        self.file_path = file_path
+    @property
+    def prompt_instructions(self) -> str:
+        return """Please extract and structure the PAN card text given below.
         
+        Please extract all required information and format it according to the specified structure, including:
+        - PAN number
+        - Full name
+        - Date of birth
+        - Father's name 
+        - Gender
+        if not able to find, leave it blank."""
+
+    async def _build_prompt(self, file_path: str, deadline: Deadline) -> DocumentPrompt:
         # Get file type and extract text
         file_type = self._get_file_type(file_path)
         if file_type == "pdf":
-            content = await self._process_pdf(file_path)
-            extracted_text = "\n".join(content) if isinstance(content, list) else str(content)
+            return await self._pdf_prompt(file_path, deadline)
         elif file_type in ["jpg", "jpeg", "png"]:
-            content = await self._process_image(file_path)
-            extracted_text = str(content)
+            return await self._image_prompt(file_path, deadline)
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
 
-        prompt = f"""Please extract and structure the following PAN card text.
-        
-        Document Text:
-        {extracted_text}
-        
-        Please extract all required information and format it according to the specified structure, including:
-        - PAN number
-        - Full name
-        - Date of birth
-        - Father's name 
-        - Gender
-        if not able to find, leave it blank.
-        """
+    def _merge_results(self, results: List[PANData]) -> PANData:
+        # Prefer a well-formed PAN number over OCR noise picked up from another chunk
+        return merge_outputs(results, choose={"pan_number": self._pick_pan_number})
 
-        result = await self.agent.run(
-            prompt,
-            deps=AgentDependencies(file_path=file_path, additional_context=validated_deps),
-            result_type=PANData
-        )
-        
-        return result.data
+    @staticmethod
+    def _pick_pan_number(values: List[str]) -> str:
+        well_formed = [value for value in values if value and len(value) == 10 and value.isalnum()]
+        present = [value for value in values if value]
+        return (well_formed or present or values)[0]
 
     def validate(self, data: PANData) -> bool:
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
-            try:
-                # Check PAN number format (10 characters alphanumeric)
-                if not (len(data.pan_number) == 10 and data.pan_number.isalnum()):
-                    raise ValueError("Invalid PAN number format")
-
-                # Check other required fields
-                if not all([
-                    data.name,
-                    data.dob,
-                    data.father_name,
-                    data.gender
-                ]):
-                    raise ValueError("Missing required fields")
+        try:
+            # Check PAN number format (10 characters alphanumeric)
+            if not (len(data.pan_number) == 10 and data.pan_number.isalnum()):
+                raise ValueError("Invalid PAN number format")
 
-                return True
+            # Check other required fields
+            if not all([
+                data.name,
+                data.dob,
+                data.father_name,
+                data.gender
+            ]):
+                raise ValueError("Missing required fields")
 
-            except ValueError as e:
-                print(f"Validation failed on attempt {retry_count + 1}: {str(e)}")
-                retry_count += 1
-                if retry_count == max_retries:
-                    return False
-                continue
\ No newline at end of file
+            return True
+        except ValueError as e:
+            logger.debug("%s validation failed: %s", self.doc_type, e)
+            return False
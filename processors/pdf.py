@@ -0,0 +1,94 @@
+import io
+from typing import Callable, Iterator, List, Optional
+from processors.document import DocumentSource, InMemoryDocument
+from processors.deadline import Deadline
+from processors.chunking import split_oversized
+
+
+def _release_pages(reader, upto: int) -> None:
+    """
+    Drop PyPDF2's references to already-read pages and resolved objects
+    (content streams, fonts, images) so they can be garbage collected.
+    Resolved objects are re-read from the file if a later page needs them.
+    """
+    flattened = getattr(reader, "flattened_pages", None)
+    if flattened:
+        for index in range(min(upto, len(flattened))):
+            flattened[index] = None
+    resolved = getattr(reader, "resolved_objects", None)
+    if resolved is not None:
+        resolved.clear()
+
+
+def iter_pdf_chunks(file_path: DocumentSource,
+                    chunk_size: int,
+                    window_pages: Optional[int] = None,
+                    max_bytes: Optional[int] = None,
+                    length: Callable[[str], int] = len,
+                    split_pages: bool = False,
+                    deadline: Optional[Deadline] = None) -> Iterator[str]:
+    """
+    Yield the text of a PDF packed page by page into chunks of at most
+    chunk_size, as measured by length (characters by default). A single page
+    longer than chunk_size becomes its own chunk unless split_pages is set, in
+    which case it is split on section boundaries.
+
+    Args:
+        file_path (str): Path to the PDF, or an InMemoryDocument
+        chunk_size (int): Maximum chunk size, measured by length
+        window_pages (int): If set, page objects are released every window_pages
+            pages so only a sliding window of the PDF object graph stays in memory
+        max_bytes (int): If set, raise ValueError once the extracted text exceeds
+            this many UTF-8 bytes
+        length (callable): Size measure for chunk_size, e.g. a token counter
+        split_pages (bool): Split pages that alone exceed chunk_size
+        deadline (Deadline): Checked before each page; parsing stops with
+            DeadlineExceeded once it has passed
+    """
+    from PyPDF2 import PdfReader
+
+    total_bytes = 0
+    current: List[str] = []
+    current_len = 0
+
+    if isinstance(file_path, InMemoryDocument):
+        source = io.BytesIO(file_path.data)
+    else:
+        source = open(file_path, "rb")
+
+    with source as stream:
+        reader = PdfReader(stream)
+        for index in range(len(reader.pages)):
+            if deadline is not None:
+                deadline.check()
+            page = reader.pages[index]
+            text = page.extract_text() or ""
+            del page
+
+            if max_bytes is not None:
+                total_bytes += len(text.encode("utf-8"))
+                if total_bytes > max_bytes:
+                    raise ValueError(
+                        f"Document text exceeds max_document_bytes ({max_bytes}) at page {index + 1}"
+                    )
+
+            text_len = length(text)
+            if split_pages and text_len > chunk_size:
+                if current:
+                    yield "".join(current)
+                    current = []
+                    current_len = 0
+                yield from split_oversized(text, chunk_size, length)
+            else:
+                if current and current_len + text_len > chunk_size:
+                    yield "".join(current)
+                    current = []
+                    current_len = 0
+                current.append(text)
+                current_len += text_len
+
+            if window_pages and (index + 1) % window_pages == 0:
+                _release_pages(reader, index + 1)
+
+    if current:
+        yield "".join(current)
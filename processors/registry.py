@@ -0,0 +1,46 @@
+import importlib
+import os
+import re
+from typing import Dict, Optional, Type
+from agent.factory import AIAgentFactory
+from config.base import BaseConfig
+
+# Registered as "module:ClassName" and imported on first use, like AIAgentFactory.MODEL_MAPPING
+PROCESSOR_REGISTRY: Dict[str, str] = {
+    "pan": "processors.pan:PANProcessor",
+    "aadhaar_front": "processors.aadhaar:AadhaarFrontProcessor",
+    "aadhaar_back": "processors.aadhaar:AadhaarBackProcessor",
+    "form16": "processors.form16:Form16Processor",
+}
+
+SUPPORTED_EXTENSIONS = {"pdf", "jpg", "jpeg", "png"}
+
+
+def get_processor_class(doc_type: str) -> Type:
+    target = PROCESSOR_REGISTRY.get(doc_type)
+    if not target:
+        raise ValueError(f"Unsupported document type: {doc_type}")
+    module_name, class_name = target.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_processor(doc_type: str, config: BaseConfig, agent_factory=AIAgentFactory):
+    """Build a processor for doc_type. Processors set their own dependencies, so each gets a copy of config."""
+    return get_processor_class(doc_type)(agent_factory, config.model_copy())
+
+
+def detect_doc_type(file_path: str) -> Optional[str]:
+    """Guess the document type from the file name, falling back to Form 16 for PDFs"""
+    name = os.path.basename(file_path).lower()
+    tokens = [token for token in re.split(r"[^a-z0-9]+", name) if token]
+    compact = "".join(tokens)
+    if "form16" in compact:
+        return "form16"
+    if "aadhaar" in compact or "aadhar" in compact:
+        return "aadhaar_back" if "back" in compact else "aadhaar_front"
+    # Token match so names like "company.png" are not taken for PAN cards
+    if any(token == "pan" or token.startswith("pancard") for token in tokens):
+        return "pan"
+    if name.endswith(".pdf"):
+        return "form16"
+    return None
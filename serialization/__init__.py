@@ -0,0 +1,4 @@
+from .encoders import dumps, dump_json, to_jsonable
+from .columnar import flatten_record, write_records
+
+__all__ = ['dumps', 'dump_json', 'to_jsonable', 'flatten_record', 'write_records']
\ No newline at end of file
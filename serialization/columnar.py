@@ -0,0 +1,133 @@
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Set
+from serialization.encoders import to_jsonable
+
+ColumnarFormat = Literal["csv", "parquet"]
+
+
+def flatten_record(record: Any, prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten a result into a single row: nested objects become dotted column
+    names and lists are stored as JSON strings.
+    """
+    data = to_jsonable(record) if prefix == "" else record
+    row: Dict[str, Any] = {}
+    for key, value in data.items():
+        column = f"{prefix}{key}"
+        if isinstance(value, dict):
+            row.update(flatten_record(value, prefix=f"{column}."))
+        elif isinstance(value, list):
+            row[column] = json.dumps(value, separators=(",", ":"))
+        else:
+            row[column] = value
+    return row
+
+
+def _batched(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_records(records: Iterable[Any],
+                  path: str,
+                  fmt: ColumnarFormat = "csv",
+                  batch_size: int = 10000,
+                  columns: Optional[List[str]] = None) -> int:
+    """
+    Stream batch results to a columnar file without holding them all in memory.
+
+    Args:
+        records: Iterable of extracted results (pydantic models or dicts)
+        path: Output file path
+        fmt: 'csv' (stdlib) or 'parquet' (requires pyarrow)
+        batch_size: Rows buffered per write for parquet
+        columns: Column order; defaults to the columns of the first record.
+            A record with columns outside this list raises ValueError, so
+            for mixed doc types pass every column or write one file per type.
+
+    Returns:
+        int: Number of records written
+    """
+    rows = (flatten_record(record) for record in records)
+    if fmt == "csv":
+        return _write_csv(rows, path, columns)
+    if fmt == "parquet":
+        return _write_parquet(rows, path, batch_size, columns)
+    raise ValueError(f"Unsupported columnar format: {fmt}")
+
+
+def _check_columns(row: Dict[str, Any], known: Set[str]) -> None:
+    unknown = row.keys() - known
+    if unknown:
+        raise ValueError(
+            f"Record has columns outside the output schema: {sorted(unknown)}. "
+            "Pass columns= with every column, or write each doc type to its own file"
+        )
+
+
+def _write_csv(rows: Iterator[Dict[str, Any]], path: str, columns: Optional[List[str]]) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = None
+        known: Set[str] = set()
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=columns or list(row))
+                known = set(writer.fieldnames)
+                writer.writeheader()
+            _check_columns(row, known)
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_parquet(rows: Iterator[Dict[str, Any]],
+                   path: str,
+                   batch_size: int,
+                   columns: Optional[List[str]]) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+
+    count = 0
+    writer = None
+    schema = None
+    known: Set[str] = set()
+    try:
+        for batch in _batched(rows, batch_size):
+            if schema is None:
+                names = columns or list(batch[0])
+                known = set(names)
+            for row in batch:
+                _check_columns(row, known)
+            if schema is None:
+                # Column types are inferred from the first batch
+                schema = pa.schema([_infer_field(pa, name, [row.get(name) for row in batch]) for name in names])
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def _infer_field(pa: Any, name: str, values: List[Any]) -> Any:
+    """
+    Arrow field for a column from its values. A column with only nulls has no
+    type to infer; it is stored as strings, which holds every flattened value
+    (lists are already JSON strings).
+    """
+    arrow_type = pa.array(values).type
+    if pa.types.is_null(arrow_type):
+        arrow_type = pa.string()
+    return pa.field(name, arrow_type)
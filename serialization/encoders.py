@@ -0,0 +1,38 @@
+from typing import Any, Literal
+from pydantic import TypeAdapter
+
+# Compiled once; pydantic-core serializes models, dates and containers without
+# going through a Python-level JSONEncoder.default() per value
+_ANY_ADAPTER = TypeAdapter(Any)
+
+OutputFormat = Literal["json", "msgpack"]
+
+
+def to_jsonable(result: Any) -> Any:
+    """Convert results (pydantic models, dates, nested containers) to JSON-compatible Python objects"""
+    return _ANY_ADAPTER.dump_python(result, mode="json")
+
+
+def dump_json(result: Any) -> str:
+    """Serialize a result to a JSON string using pydantic's compiled serializer"""
+    return _ANY_ADAPTER.dump_json(result).decode()
+
+
+def dumps(result: Any, fmt: OutputFormat = "json") -> bytes:
+    """
+    Serialize a result to bytes.
+
+    Args:
+        result: Extracted data, a pydantic model or any nesting of dicts/lists of them
+        fmt: 'json' (pydantic-core) or 'msgpack'. msgpack needs the optional
+            msgpack package.
+    """
+    if fmt == "json":
+        return _ANY_ADAPTER.dump_json(result)
+    if fmt == "msgpack":
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("msgpack output requires msgpack: pip install msgpack")
+        return msgpack.packb(to_jsonable(result))
+    raise ValueError(f"Unsupported output format: {fmt}")
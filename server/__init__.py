@@ -0,0 +1,3 @@
+from .app import create_app, ExtractionService
+
+__all__ = ['create_app', 'ExtractionService']
\ No newline at end of file
@@ -0,0 +1,372 @@
+"""
+Optional ASGI front-end for the document processors.
+
+    pip install ".[server]"
+    uvicorn server.app:app              # reads GOV_DOC_* environment variables
+
+Endpoints:
+    POST /extract/{doc_type}            multipart upload (field "file") or raw body
+         ?mode=sync                     wait and return the extraction (default)
+         ?mode=async                    return 202 with a job id immediately
+    GET  /jobs/{job_id}                 poll an async job
+    GET  /healthz                       liveness and current load
+    GET  /metrics                       Prometheus text format
+"""
+import asyncio
+import os
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from config.base import BaseConfig
+from processors.document import InMemoryDocument
+from processors.deadline import DeadlineExceeded
+from processors.registry import PROCESSOR_REGISTRY, SUPPORTED_EXTENSIONS, create_processor
+from serialization import to_jsonable
+
+try:
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, PlainTextResponse
+    from starlette.routing import Route
+except ImportError:
+    raise ImportError('The HTTP service requires starlette: pip install ".[server]"')
+
+CONTENT_TYPE_EXTENSIONS = {
+    "application/pdf": "pdf",
+    "image/png": "png",
+    "image/jpeg": "jpg",
+}
+
+# Seconds a document may take when the config sets no request_timeout
+DEFAULT_REQUEST_TIMEOUT = 120.0
+
+
+class UploadError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class Job:
+    doc_type: str
+    status: str = "pending"  # pending -> running -> done | failed
+    result: Any = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+
+
+class ServiceMetrics:
+    """Counters exposed on /metrics"""
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.documents: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.processing_seconds: Dict[str, float] = defaultdict(float)
+        self.rejected = 0
+
+    def render(self, in_flight: int, max_in_flight: int, jobs: int) -> str:
+        lines = [
+            "# TYPE gov_doc_requests_total counter",
+            *(f'gov_doc_requests_total{{mode="{mode}",status="{status}"}} {count}'
+              for (mode, status), count in sorted(self.requests.items())),
+            "# TYPE gov_doc_rejected_total counter",
+            f"gov_doc_rejected_total {self.rejected}",
+            "# TYPE gov_doc_documents_total counter",
+            *(f'gov_doc_documents_total{{doc_type="{doc_type}",outcome="{outcome}"}} {count}'
+              for (doc_type, outcome), count in sorted(self.documents.items())),
+            "# TYPE gov_doc_processing_seconds_total counter",
+            *(f'gov_doc_processing_seconds_total{{doc_type="{doc_type}"}} {seconds:.6f}'
+              for doc_type, seconds in sorted(self.processing_seconds.items())),
+            "# TYPE gov_doc_in_flight gauge",
+            f"gov_doc_in_flight {in_flight}",
+            "# TYPE gov_doc_max_in_flight gauge",
+            f"gov_doc_max_in_flight {max_in_flight}",
+            "# TYPE gov_doc_jobs gauge",
+            f"gov_doc_jobs {jobs}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+async def read_upload(request: Request, max_bytes: int) -> InMemoryDocument:
+    """
+    Read the uploaded document into memory, streaming the body so oversized
+    uploads are rejected early. Multipart bodies are fed chunk by chunk to
+    python-multipart's streaming parser instead of Starlette's spooled files,
+    so only the file part is ever held in memory.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        return await _read_multipart(request, content_type, max_bytes)
+
+    chunks = []
+    size = 0
+    async for chunk in _limited(request, max_bytes):
+        chunks.append(chunk)
+        size += len(chunk)
+
+    extension = CONTENT_TYPE_EXTENSIONS.get(content_type.split(";")[0].strip())
+    name = request.query_params.get("filename") or (f"upload.{extension}" if extension else "")
+    if not size or not name:
+        raise UploadError(400, "Send a multipart 'file' field, or a raw PDF/PNG/JPEG body")
+    # A single-chunk body is used as is; otherwise the chunks are joined once
+    return InMemoryDocument(name=name, data=chunks[0] if len(chunks) == 1 else b"".join(chunks))
+
+
+async def _limited(request: Request, max_bytes: int) -> AsyncIterator[bytes]:
+    """Body chunks, raising 413 as soon as more than max_bytes have arrived"""
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadError(413, f"Upload exceeds {max_bytes} bytes")
+        if chunk:
+            yield chunk
+
+
+async def _read_multipart(request: Request, content_type: str, max_bytes: int) -> InMemoryDocument:
+    try:
+        from python_multipart.exceptions import MultipartParseError
+        from python_multipart.multipart import MultipartParser, parse_options_header
+    except ImportError:
+        from multipart.exceptions import MultipartParseError
+        from multipart.multipart import MultipartParser, parse_options_header
+
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadError(400, "Missing multipart boundary")
+
+    state = {"header_field": b"", "header_value": b"", "headers": {}, "data": None, "name": "", "file": None}
+
+    def on_part_begin():
+        state["headers"] = {}
+        state["data"] = None
+
+    def on_header_field(data, start, end):
+        state["header_field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["header_value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["header_field"].lower()] = state["header_value"]
+        state["header_field"] = b""
+        state["header_value"] = b""
+
+    def on_headers_finished():
+        # Only the first "file" part with a filename is kept; other parts are skipped
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        if state["file"] is None and disposition.get(b"name") == b"file" and disposition.get(b"filename"):
+            state["data"] = []
+            state["name"] = disposition[b"filename"].decode("utf-8", "replace")
+
+    def on_part_data(data, start, end):
+        if state["data"] is not None:
+            state["data"].append(data[start:end])
+
+    def on_part_end():
+        if state["data"] is not None:
+            state["file"] = InMemoryDocument(name=state["name"], data=b"".join(state["data"]))
+            state["data"] = None
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        async for chunk in _limited(request, max_bytes):
+            parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError as e:
+        raise UploadError(400, f"Malformed multipart body: {e}")
+
+    if state["file"] is None:
+        raise UploadError(400, "Multipart body has no 'file' field")
+    return state["file"]
+
+
+class ExtractionService:
+    """
+    State behind the ASGI app. max_in_flight bounds the documents being
+    processed at once, sync and async together; requests beyond it get 429.
+    Documents get request_timeout seconds unless the config sets its own, so
+    a stuck request cannot hold an in-flight slot forever.
+    """
+
+    def __init__(self,
+                 config: BaseConfig,
+                 max_in_flight: int = 32,
+                 max_upload_bytes: int = 20 * 1024 * 1024,
+                 job_ttl: float = 3600.0,
+                 request_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        if config.request_timeout is None:
+            config = config.model_copy(update={"request_timeout": request_timeout})
+        self.config = config
+        self.max_in_flight = max_in_flight
+        self.max_upload_bytes = max_upload_bytes
+        self.job_ttl = job_ttl
+        self.in_flight = 0
+        self.jobs: Dict[str, Job] = {}
+        self.metrics = ServiceMetrics()
+        # One processor per doc type, shared by all requests; processors keep
+        # no per-document state, so concurrent requests can use the same one
+        self.processors: Dict[str, Any] = {}
+        self._tasks = set()
+
+    def get_processor(self, doc_type: str) -> Any:
+        """Processor for doc_type, built on first use and reused for later documents"""
+        processor = self.processors.get(doc_type)
+        if processor is None:
+            processor = self.processors[doc_type] = create_processor(doc_type, self.config)
+        return processor
+
+    async def _process(self, doc_type: str, document: InMemoryDocument) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await self.get_processor(doc_type).process(document)
+        except Exception:
+            self.metrics.documents[(doc_type, "failed")] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.metrics.processing_seconds[doc_type] += time.perf_counter() - started
+        self.metrics.documents[(doc_type, "succeeded")] += 1
+        return to_jsonable(result)
+
+    async def _run_job(self, job: Job, document: InMemoryDocument) -> None:
+        job.status = "running"
+        try:
+            job.result = await self._process(job.doc_type, document)
+            job.status = "done"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+        job.finished = time.time()
+
+    def _expire_jobs(self) -> None:
+        cutoff = time.time() - self.job_ttl
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished and job.finished < cutoff]:
+            del self.jobs[job_id]
+
+    async def extract(self, request: Request) -> JSONResponse:
+        mode = request.query_params.get("mode", "sync")
+        doc_type = request.path_params["doc_type"]
+        if doc_type not in PROCESSOR_REGISTRY:
+            self.metrics.requests[(mode, 404)] += 1
+            return JSONResponse({"error": f"Unsupported document type: {doc_type}"}, status_code=404)
+        if mode not in ("sync", "async"):
+            self.metrics.requests[(mode, 400)] += 1
+            return JSONResponse({"error": "mode must be 'sync' or 'async'"}, status_code=400)
+
+        # Reject before reading the body so overload costs as little as possible
+        if self.in_flight >= self.max_in_flight:
+            self.metrics.rejected += 1
+            self.metrics.requests[(mode, 429)] += 1
+            return JSONResponse({"error": "Too many documents in flight"}, status_code=429,
+                                headers={"Retry-After": "1"})
+        self.in_flight += 1
+
+        try:
+            document = await read_upload(request, self.max_upload_bytes)
+            if document.name.rsplit(".", 1)[-1].lower() not in SUPPORTED_EXTENSIONS:
+                raise UploadError(415, f"Unsupported file type: {document.name}")
+        except UploadError as e:
+            self.in_flight -= 1
+            self.metrics.requests[(mode, e.status_code)] += 1
+            return JSONResponse({"error": e.detail}, status_code=e.status_code)
+        except BaseException:
+            self.in_flight -= 1
+            raise
+
+        if mode == "async":
+            self._expire_jobs()
+            job_id = uuid.uuid4().hex
+            job = self.jobs[job_id] = Job(doc_type=doc_type)
+            task = asyncio.create_task(self._run_job(job, document))
+            # Keep a reference so the task is not garbage collected mid-run
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            self.metrics.requests[(mode, 202)] += 1
+            return JSONResponse({"job_id": job_id, "status": job.status}, status_code=202,
+                                headers={"Location": f"/jobs/{job_id}"})
+
+        try:
+            result = await self._process(doc_type, document)
+        except DeadlineExceeded as e:
+            self.metrics.requests[(mode, 504)] += 1
+            return JSONResponse({"error": str(e)}, status_code=504)
+        except Exception as e:
+            self.metrics.requests[(mode, 422)] += 1
+            return JSONResponse({"error": f"{type(e).__name__}: {e}"}, status_code=422)
+        self.metrics.requests[(mode, 200)] += 1
+        return JSONResponse({"doc_type": doc_type, "result": result})
+
+    async def job_status(self, request: Request) -> JSONResponse:
+        job = self.jobs.get(request.path_params["job_id"])
+        if job is None:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+        body = {"status": job.status, "doc_type": job.doc_type}
+        if job.status == "done":
+            body["result"] = job.result
+        elif job.status == "failed":
+            body["error"] = job.error
+        return JSONResponse(body)
+
+    async def healthz(self, request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "in_flight": self.in_flight, "max_in_flight": self.max_in_flight})
+
+    async def metrics_endpoint(self, request: Request) -> PlainTextResponse:
+        return PlainTextResponse(
+            self.metrics.render(self.in_flight, self.max_in_flight, len(self.jobs)),
+            media_type="text/plain; version=0.0.4"
+        )
+
+
+def create_app(config: BaseConfig,
+               max_in_flight: int = 32,
+               max_upload_bytes: int = 20 * 1024 * 1024,
+               job_ttl: float = 3600.0,
+               request_timeout: float = DEFAULT_REQUEST_TIMEOUT) -> Starlette:
+    """
+    Build the ASGI app. For local testing without network access use
+    BaseConfig(model_type="test", model_name="test", api_key="").
+    """
+    service = ExtractionService(config, max_in_flight=max_in_flight,
+                                max_upload_bytes=max_upload_bytes, job_ttl=job_ttl,
+                                request_timeout=request_timeout)
+    app = Starlette(routes=[
+        Route("/extract/{doc_type}", service.extract, methods=["POST"]),
+        Route("/jobs/{job_id}", service.job_status, methods=["GET"]),
+        Route("/healthz", service.healthz, methods=["GET"]),
+        Route("/metrics", service.metrics_endpoint, methods=["GET"]),
+    ])
+    app.state.service = service
+    return app
+
+
+def _app_from_env() -> Starlette:
+    config = BaseConfig(
+        model_type=os.environ.get("GOV_DOC_MODEL_TYPE", "openai"),
+        model_name=os.environ.get("GOV_DOC_MODEL_NAME", "gpt-4o-mini"),
+        api_key=os.environ.get("GOV_DOC_API_KEY", ""),
+        request_timeout=float(os.environ.get("GOV_DOC_REQUEST_TIMEOUT", DEFAULT_REQUEST_TIMEOUT)),
+    )
+    return create_app(config, max_in_flight=int(os.environ.get("GOV_DOC_MAX_IN_FLIGHT", "32")))
+
+
+def __getattr__(name):
+    # "uvicorn server.app:app" builds the app from the environment on first access
+    if name == "app":
+        value = globals()["app"] = _app_from_env()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
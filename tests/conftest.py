@@ -0,0 +1,101 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+import pytest
+from processors.document import InMemoryDocument
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """Minimal PDF with one text line per page, enough for PyPDF2's text extraction"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        stream = f"BT /F1 12 Tf 72 720 Td ({escaped}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+@pytest.fixture
+def pdf_document():
+    """Build an in-memory PDF upload from page texts"""
+    def build(name: str, pages: List[str]) -> InMemoryDocument:
+        return InMemoryDocument(name=name, data=make_pdf(pages))
+    return build
+
+
+class OpenAIStub:
+    """
+    Local OpenAI-compatible chat completions endpoint that answers every
+    request with a final_result tool call carrying `output`. Connections are
+    kept alive, like the real API, so pooled connections get reused.
+    """
+
+    def __init__(self, output: Dict[str, Any]):
+        self.output = output
+        self.requests: List[Dict[str, Any]] = []
+        self.connections = set()  # Client (host, port) pairs, one per TCP connection
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                stub.requests.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+                stub.connections.add(self.client_address)
+                body = json.dumps(stub.completion()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def completion(self) -> Dict[str, Any]:
+        call = {"id": "call_1", "type": "function",
+                "function": {"name": "final_result", "arguments": json.dumps(self.output)}}
+        return {
+            "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+            "choices": [{"index": 0, "finish_reason": "tool_calls",
+                         "message": {"role": "assistant", "content": None, "tool_calls": [call]}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        }
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+PAN_OUTPUT = {"pan_number": "ABCDE1234F", "name": "Asha Rao", "dob": "1990-01-02",
+              "gender": "F", "father_name": "Ravi Rao"}
+
+
+@pytest.fixture
+def openai_stub(monkeypatch):
+    """Real OpenAI provider pointed at a local stub returning a PAN extraction"""
+    stub = OpenAIStub(PAN_OUTPUT)
+    monkeypatch.setenv("OPENAI_BASE_URL", stub.base_url)
+    yield stub
+    stub.close()
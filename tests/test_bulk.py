@@ -0,0 +1,113 @@
+import io
+import json
+import os
+import tarfile
+import zipfile
+import pytest
+import cli.bulk as bulk
+from cli.bulk import iter_documents, load_checkpoint, run
+from config.base import BaseConfig
+
+
+@pytest.fixture
+def pdf(pdf_document):
+    return pdf_document("pan.pdf", ["PAN ABCDE1234F"]).data
+
+
+def write_inputs(root, pdf):
+    """scans/ with a PDF, an unsupported file, and nested zip and tar archives"""
+    scans = root / "scans"
+    (scans / "sub").mkdir(parents=True)
+    (scans / "pan_1.pdf").write_bytes(pdf)
+    (scans / "notes.txt").write_text("skip me")
+    with zipfile.ZipFile(scans / "batch.zip", "w") as archive:
+        archive.writestr("cards/pan_2.pdf", pdf)
+        archive.writestr("cards/readme.md", "skip me")
+    with tarfile.open(scans / "sub" / "more.tar", "w") as archive:
+        info = tarfile.TarInfo("deep/pan_3.pdf")
+        info.size = len(pdf)
+        archive.addfile(info, io.BytesIO(pdf))
+    return scans
+
+
+def test_iter_documents_walks_directories_and_archives(tmp_path, pdf):
+    scans = write_inputs(tmp_path, pdf)
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+
+    documents = list(iter_documents([str(scans), str(tmp_path / "missing.pdf")], str(workdir)))
+    keys = [document.key for document in documents]
+    assert keys == [f"{scans}/batch.zip!cards/pan_2.pdf", f"{scans}/pan_1.pdf",
+                    f"{scans}/sub/more.tar!deep/pan_3.pdf"]
+    assert [document.temporary for document in documents] == [True, False, True]
+    for document in documents:
+        # Members keep their base name so the doc type can still be detected
+        assert os.path.basename(document.file_path).startswith("pan_")
+        assert open(document.file_path, "rb").read() == pdf
+        if document.temporary:
+            assert document.file_path.startswith(str(workdir))
+
+
+def test_iter_documents_extracts_archive_members_lazily(tmp_path, pdf):
+    with zipfile.ZipFile(tmp_path / "batch.zip", "w") as archive:
+        for index in range(3):
+            archive.writestr(f"pan_{index}.pdf", pdf)
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+
+    documents = iter_documents([str(tmp_path / "batch.zip")], str(workdir))
+    next(documents)
+    assert len(os.listdir(workdir)) == 1
+
+
+def read_output(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def counted_processors(monkeypatch):
+    created = []
+    original = bulk.create_processor
+
+    def create_processor(doc_type, config):
+        created.append(doc_type)
+        return original(doc_type, config)
+
+    monkeypatch.setattr(bulk, "create_processor", create_processor)
+    return created
+
+
+def test_run_shares_one_processor_per_doc_type_and_resumes(tmp_path, pdf, counted_processors):
+    scans = write_inputs(tmp_path, pdf)
+    (scans / "unknown.png").write_bytes(b"not an image")
+    output, checkpoint = tmp_path / "out.jsonl", tmp_path / "run.ckpt"
+    config = BaseConfig(model_type="test", model_name="test", api_key="")
+
+    outcomes = run([str(scans)], str(output), config, workers=2, checkpoint=str(checkpoint))
+    assert len(outcomes) == 4
+    assert counted_processors == ["pan"]
+    records = {record["file"]: record for record in read_output(output)}
+    assert "Could not detect document type" in records[f"{scans}/unknown.png"]["error"]
+    assert all(set(record["result"]) == {"pan_number", "name", "dob", "gender", "father_name"}
+               for key, record in records.items() if key.endswith(".pdf"))
+    # Failures are not checkpointed, so they are retried on resume
+    assert load_checkpoint(str(checkpoint)) == {key for key in records if key.endswith(".pdf")}
+
+    (scans / "pan_4.pdf").write_bytes(pdf)
+    resumed = run([str(scans)], str(output), config, workers=2, checkpoint=str(checkpoint))
+    assert sorted(outcome.key for outcome in resumed) == [f"{scans}/pan_4.pdf", f"{scans}/unknown.png"]
+    assert len(read_output(output)) == 6
+
+
+def test_run_reuses_provider_connections(tmp_path, pdf, openai_stub, counted_processors):
+    scans = write_inputs(tmp_path, pdf)
+    config = BaseConfig(model_type="openai", model_name="gpt-4o", api_key="sk-test")
+
+    outcomes = run([str(scans)], str(tmp_path / "out.jsonl"), config, workers=1)
+    assert [outcome.error for outcome in outcomes] == [None, None, None]
+    assert all(outcome.result.pan_number == "ABCDE1234F" for outcome in outcomes)
+    assert counted_processors == ["pan"]
+    # One keep-alive connection serves every document
+    assert len(openai_stub.requests) == 3
+    assert len(openai_stub.connections) == 1
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+from config.base import BaseConfig, ModelRouteConfig
+from processors.data_classes.pan_dataclass import PANData
+from processors.registry import create_processor
+
+VALID = PANData(pan_number="ABCDE1234F", name="Asha Rao", dob=date(1990, 1, 2),
+                gender="F", father_name="Ravi Rao")
+INVALID = VALID.model_copy(update={"pan_number": "bad"})
+
+
+class StubAgent:
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.calls = 0
+
+    async def run(self, prompt, **kwargs):
+        self.calls += 1
+        if isinstance(self.outcome, BaseException):
+            raise self.outcome
+        return SimpleNamespace(output=self.outcome)
+
+
+def cascade_processor(cheap, primary):
+    config = BaseConfig(model_type="test", model_name="test", api_key="",
+                        cascade_model=ModelRouteConfig(model_type="test", model_name="cheap"))
+    processor = create_processor("pan", config)
+    processor.cascade_agent = StubAgent(cheap)
+    processor.agent = StubAgent(primary)
+    return processor
+
+
+@pytest.mark.parametrize("cheap", [INVALID, ModelHTTPError(503, "cheap")])
+def test_cascade_escalates_on_invalid_output_or_model_error(cheap, pdf_document):
+    processor = cascade_processor(cheap, VALID)
+    assert asyncio.run(processor.process(pdf_document("pan.pdf", ["PAN ABCDE1234F"]))) == VALID
+    assert processor.agent.calls == 1
+
+
+def test_cascade_skips_primary_when_cheap_output_validates(pdf_document):
+    processor = cascade_processor(VALID, INVALID)
+    assert asyncio.run(processor.process(pdf_document("pan.pdf", ["PAN ABCDE1234F"]))) == VALID
+    assert processor.agent.calls == 0
+
+
+def test_cascade_does_not_swallow_unexpected_errors(pdf_document):
+    processor = cascade_processor(KeyError("bug"), VALID)
+    with pytest.raises(KeyError):
+        asyncio.run(processor.process(pdf_document("pan.pdf", ["PAN ABCDE1234F"])))
+    assert processor.agent.calls == 0
+
+
+def test_cascade_stats_count_every_record_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    from agent.cascade import CascadeStats
+
+    stats = CascadeStats()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda index: stats.record("pan", escalated=index % 4 == 0), range(8000)))
+    assert stats.report() == {"pan": {"attempts": 8000, "escalations": 2000, "escalation_rate": 0.25}}
+    stats.reset()
+    assert stats.report() == {}
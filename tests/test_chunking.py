@@ -0,0 +1,180 @@
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+import pytest
+import processors.chunking as chunking
+from config.base import BaseConfig, ModelRouteConfig
+from processors.chunking import (_estimate_tokens, chunk_token_budget, get_token_counter, largest_token_counter,
+                                 split_oversized)
+from processors.data_classes.form_16_dataclass import (CertificateDetails, DeducteeDetails, DeductorDetails,
+                                                       Form16Output, PaymentSummary, Period, VerificationDetails)
+from processors.data_classes.pan_dataclass import PANData
+from processors.registry import create_processor
+
+
+def words(count: int, prefix: str = "w") -> str:
+    return " ".join(f"{prefix}{index}" for index in range(count))
+
+
+def test_split_oversized_keeps_short_text_whole():
+    assert list(split_oversized("short text", 10, len)) == ["short text"]
+
+
+def test_split_oversized_prefers_section_boundaries():
+    sections = [words(30, "a"), words(30, "b"), words(30, "c")]
+    text = "\n\n".join(sections)
+    limit = len(sections[0]) + 10
+
+    chunks = list(split_oversized(text, limit, len))
+    assert chunks == sections
+
+
+def test_split_oversized_falls_back_to_lines_and_hard_splits():
+    long_line = "x" * 250
+    text = "\n".join([words(10), long_line, words(10, "y")])
+
+    chunks = list(split_oversized(text, 100, len))
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
+    assert chunks[0] == words(10)
+    assert chunks[-1] == words(10, "y")
+
+
+@pytest.mark.parametrize("length", [len, _estimate_tokens, get_token_counter("gpt-4o")])
+def test_split_oversized_respects_limit_and_order(length):
+    paragraphs = [words(size, f"p{index}_") for index, size in enumerate([5, 120, 40, 300, 8])]
+    text = "\n\n".join("\n".join([paragraph[:len(paragraph) // 2], paragraph[len(paragraph) // 2:]])
+                       for paragraph in paragraphs)
+
+    chunks = list(split_oversized(text, 150, length))
+    assert all(length(chunk) <= 150 for chunk in chunks)
+    # No text is lost or reordered; only the separators at chunk edges are dropped
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
+
+
+def test_chunk_token_budget_subtracts_prompt_schema_and_output():
+    large = chunk_token_budget("gpt-4o", "system", PANData, reserved_output_tokens=1000)
+    assert 0 < large < 128000 - 1000
+    assert chunk_token_budget("gpt-4o", "system", PANData, reserved_output_tokens=2000) == large - 1000
+    assert chunk_token_budget("gpt-4o", "system", PANData, 1000, context_window=20000) == large - 108000
+    # Longer prefix wins: gpt-4-32k is not treated as gpt-4
+    assert (chunk_token_budget("gpt-4-32k", "", PANData, 0)
+            - chunk_token_budget("gpt-4", "", PANData, 0)) == 32768 - 8192
+
+
+def test_chunk_token_budget_rejects_window_without_room():
+    with pytest.raises(ValueError, match="No room for document text"):
+        chunk_token_budget("gpt-4", "system", Form16Output, reserved_output_tokens=8192)
+
+
+@pytest.mark.parametrize("route", ["cascade_model", "hedge_model"])
+def test_chunk_budget_fits_the_smallest_model_a_chunk_can_reach(route):
+    small = ModelRouteConfig(model_type="test", model_name="gpt-4")
+    config = BaseConfig(model_type="test", model_name="gpt-4o", api_key="", chunk_by_tokens=True,
+                        reserved_output_tokens=1000, context_window=100000, **{route: small})
+    processor = create_processor("pan", config)
+    # context_window overrides the routed model only; gpt-4 keeps its own 8192 window
+    assert processor.chunk_size == chunk_token_budget("gpt-4", processor.agent_system_prompt, PANData, 1000)
+
+    without_route = create_processor("pan", config.model_copy(update={route: None}))
+    assert without_route.chunk_size == chunk_token_budget("gpt-4o", without_route.agent_system_prompt, PANData,
+                                                          1000, context_window=100000)
+
+
+def test_largest_token_counter_takes_the_most_conservative_count(monkeypatch):
+    counters = {"a": len, "b": lambda text: 2 * len(text), "c": len}
+    monkeypatch.setattr(chunking, "get_token_counter", counters.__getitem__)
+    assert largest_token_counter(["a", "c"]) is len
+    assert largest_token_counter(["a", "b", "c"])("four") == 8
+
+
+def form16(payments, deductor_name="", verification_name=""):
+    return Form16Output(
+        deductor_details=DeductorDetails(name=deductor_name, address="", pan="", tan=""),
+        deductee_details=DeducteeDetails(name="", address="", pan=""),
+        certificate_details=CertificateDetails(certificate_number="", last_updated_date="", assessment_year="",
+                                               period=Period(from_date="", to_date="")),
+        summary_of_payment=[PaymentSummary(amount=amount, nature="salary", date="") for amount in payments],
+        summary_of_tax_deducted_at_source=[],
+        details_of_tax_deposited=[],
+        verification_details=VerificationDetails(name=verification_name, designation="",
+                                                 verification_statement="", place_and_date_of_verification=""),
+        tax_deposited_in_respect_of_deduction=[]
+    )
+
+
+def chunked_processor(doc_type, outputs, max_concurrent_chunks=4):
+    """Processor whose token budget leaves room for roughly one 30-word page per call"""
+    processor = create_processor(doc_type, BaseConfig(model_type="test", model_name="gpt-4o", api_key=""))
+    budget = chunk_token_budget("gpt-4o", processor.agent_system_prompt, processor.output_type, 4096,
+                                context_window=100000)
+    config = BaseConfig(model_type="test", model_name="gpt-4o", api_key="", chunk_by_tokens=True,
+                        context_window=100000 - budget + 80, max_concurrent_chunks=max_concurrent_chunks)
+    processor = create_processor(doc_type, config)
+    assert processor.chunk_size == 80
+
+    prompts = []
+
+    class ChunkAgent:
+        in_flight = peak = 0
+
+        async def run(self, prompt, **kwargs):
+            prompts.append(prompt)
+            page = next(index for index in range(len(outputs)) if f"Page {index}" in prompt)
+            ChunkAgent.in_flight += 1
+            ChunkAgent.peak = max(ChunkAgent.peak, ChunkAgent.in_flight)
+            # Later chunks finish first; the merge must still follow page order
+            await asyncio.sleep(0.01 * (len(outputs) - page))
+            ChunkAgent.in_flight -= 1
+            return SimpleNamespace(output=outputs[page])
+
+    processor.agent = ChunkAgent()
+    return processor, prompts
+
+
+def test_form16_chunks_get_one_call_each_and_merge_lists(pdf_document):
+    outputs = [form16(["100"], deductor_name="Acme"), form16(["200", "100"]),
+               form16(["300"], verification_name="R. Rao")]
+    processor, prompts = chunked_processor("form16", outputs)
+    pages = [f"Page {index} " + words(30, f"p{index}_") for index in range(3)]
+
+    merged = asyncio.run(processor.process(pdf_document("form16.pdf", pages)))
+    assert len(prompts) == 3
+    assert processor.agent.peak == 3
+    for prompt in prompts:
+        assert prompt.startswith("Document Text:\n")
+        assert processor.prompt_instructions not in prompt
+        assert sum(f"Page {page}" in prompt for page in range(3)) == 1
+    assert [payment.amount for payment in merged.summary_of_payment] == ["100", "200", "300"]
+    assert merged.deductor_details.name == "Acme"
+    assert merged.verification_details.name == "R. Rao"
+
+
+def test_chunk_calls_are_capped_by_max_concurrent_chunks(pdf_document):
+    outputs = [form16([str(index)]) for index in range(4)]
+    processor, prompts = chunked_processor("form16", outputs, max_concurrent_chunks=2)
+    pages = [f"Page {index} " + words(30, f"p{index}_") for index in range(4)]
+
+    merged = asyncio.run(processor.process(pdf_document("form16.pdf", pages)))
+    assert len(prompts) == 4
+    assert processor.agent.peak == 2
+    assert [payment.amount for payment in merged.summary_of_payment] == ["0", "1", "2", "3"]
+
+
+def test_pan_merge_prefers_well_formed_pan_number():
+    processor = create_processor("pan", BaseConfig(model_type="test", model_name="test", api_key=""))
+    noisy = PANData(pan_number="ABCDE", name="", dob=date(1990, 1, 2), gender="", father_name="Ravi Rao")
+    clean = PANData(pan_number="ABCDE1234F", name="Asha Rao", dob=date(1990, 1, 2), gender="F", father_name="")
+
+    merged = processor._merge_results([noisy, clean])
+    assert (merged.pan_number, merged.name, merged.father_name, merged.gender) == \
+        ("ABCDE1234F", "Asha Rao", "Ravi Rao", "F")
+    assert processor.validate(merged)
+
+
+def test_single_chunk_is_not_merged(pdf_document):
+    outputs = [form16(["100"])]
+    processor, prompts = chunked_processor("form16", outputs)
+
+    assert asyncio.run(processor.process(pdf_document("form16.pdf", ["Page 0 short"]))) is outputs[0]
+    assert len(prompts) == 1
@@ -0,0 +1,44 @@
+import csv
+from datetime import date
+import pytest
+from processors.data_classes.pan_dataclass import PANData
+from serialization import write_records
+
+PAN = PANData(pan_number="ABCDE1234F", name="Asha Rao", dob=date(1990, 1, 2), gender="F", father_name="Ravi Rao")
+
+
+def test_csv_rejects_columns_outside_the_schema(tmp_path):
+    records = [PAN, {"aadhaar_number": "123412341234"}]
+    with pytest.raises(ValueError, match="aadhaar_number"):
+        write_records(records, str(tmp_path / "out.csv"))
+
+
+def test_csv_with_explicit_columns_writes_mixed_records(tmp_path):
+    path = tmp_path / "out.csv"
+    columns = list(PANData.model_fields) + ["aadhaar_number"]
+    assert write_records([PAN, {"aadhaar_number": "123412341234"}], str(path), columns=columns) == 2
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["pan_number"] == "ABCDE1234F"
+    assert rows[1]["aadhaar_number"] == "123412341234"
+
+
+def test_parquet_infers_column_types(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+    records = [{"name": "a", "amount": 10, "ratio": 0.5, "items": [1, 2], "note": None},
+               {"name": "b", "amount": 20, "ratio": 1.5, "items": [], "note": "late"}]
+    assert write_records(records, str(path), fmt="parquet", batch_size=1) == 2
+
+    table = pq.read_table(path)
+    types = {field.name: str(field.type) for field in table.schema}
+    assert types == {"name": "string", "amount": "int64", "ratio": "double", "items": "string", "note": "string"}
+    assert table.column("amount").to_pylist() == [10, 20]
+    assert table.column("note").to_pylist() == [None, "late"]
+
+
+def test_parquet_rejects_columns_outside_the_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError, match="extra"):
+        write_records([{"a": 1}, {"a": 2, "extra": 3}], str(tmp_path / "out.parquet"), fmt="parquet", batch_size=1)
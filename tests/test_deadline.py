@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import date
+import numpy as np
+import pytest
+from config.base import BaseConfig
+from processors.data_classes.pan_dataclass import PANData
+from processors.deadline import Deadline, DeadlineExceeded
+from processors.registry import create_processor
+
+PAN = PANData(pan_number="ABCDE1234F", name="Asha Rao", dob=date(1990, 1, 2), gender="F", father_name="Ravi Rao")
+
+
+class StreamResult:
+    def __init__(self, partials, delays):
+        self.partials = partials
+        self.delays = delays
+
+    async def stream_output(self):
+        for partial, delay in zip(self.partials, self.delays):
+            await asyncio.sleep(delay)
+            yield partial
+
+
+class StreamingAgent:
+    """run_stream stub: waits opening_delay, then yields each partial after its delay"""
+
+    def __init__(self, partials, delays, opening_delay=0.0):
+        self.result = StreamResult(partials, delays)
+        self.opening_delay = opening_delay
+
+    @asynccontextmanager
+    async def run_stream(self, prompt, **kwargs):
+        await asyncio.sleep(self.opening_delay)
+        yield self.result
+
+
+def streaming_processor(agent):
+    processor = create_processor("pan", BaseConfig(model_type="test", model_name="test", api_key=""))
+    processor.agent = agent
+    return processor
+
+
+async def consume(processor, document, timeout, pause=0.0):
+    partials = []
+    async for partial in processor.process_stream(document, deadline=Deadline.after(timeout)):
+        partials.append(partial)
+        await asyncio.sleep(pause)
+    return partials
+
+
+def test_call_timeout_is_never_zero():
+    assert Deadline().call_timeout() is None
+    assert 0 < Deadline.after(5).call_timeout() <= 5
+    with pytest.raises(DeadlineExceeded):
+        Deadline.after(0).call_timeout()
+
+
+@pytest.mark.parametrize("opening_delay, delays", [(10, [0]), (0, [0, 10])],
+                         ids=["before-first-chunk", "between-chunks"])
+def test_stalled_stream_is_aborted(opening_delay, delays, pdf_document):
+    processor = streaming_processor(StreamingAgent([PAN, PAN], delays, opening_delay))
+    document = pdf_document("pan.pdf", ["PAN ABCDE1234F"])
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded, match="model"):
+        asyncio.run(consume(processor, document, timeout=0.3))
+    assert time.monotonic() - started < 2
+
+
+def test_consumer_is_not_cancelled_while_holding_a_partial(pdf_document):
+    processor = streaming_processor(StreamingAgent([PAN, PAN, PAN], [0, 0, 0]))
+    document = pdf_document("pan.pdf", ["PAN ABCDE1234F"])
+
+    # The consumer's own sleep outlives the deadline but is not cancelled;
+    # the stream fails once control returns to it
+    async def slow_consumer():
+        stream = processor.process_stream(document, deadline=Deadline.after(0.3))
+        assert await stream.__anext__() == PAN
+        await asyncio.sleep(0.5)
+        with pytest.raises(DeadlineExceeded):
+            await stream.__anext__()
+
+    asyncio.run(slow_consumer())
+    assert asyncio.run(consume(processor, document, timeout=1, pause=0.05)) == [PAN, PAN, PAN]
+
+
+@pytest.fixture
+def fake_tesseract(tmp_path, monkeypatch):
+    """Point pytesseract at a script that logs its pid, sleeps for the given delay and prints "text" """
+    pytesseract = pytest.importorskip("pytesseract")
+    log = tmp_path / "pids"
+
+    def install(delay=0.0):
+        script = tmp_path / "tesseract"
+        script.write_text(f"#!{sys.executable}\n"
+                          "import os, sys, time\n"
+                          f"open({str(log)!r}, 'a').write(f'{{os.getpid()}}\\n')\n"
+                          "sys.stdin.buffer.read()\n"
+                          f"time.sleep({delay})\n"
+                          "print('text')\n")
+        script.chmod(0o755)
+        monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(script))
+        return lambda: [int(pid) for pid in log.read_text().split()] if log.exists() else []
+    return install
+
+
+def test_ocr_with_expired_deadline_never_starts_tesseract(fake_tesseract):
+    pids = fake_tesseract()
+    processor = streaming_processor(None)
+    gray = np.full((20, 20), 200, dtype=np.uint8)
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(processor._process_image(gray, Deadline.after(0)))
+    assert pids() == []
+
+    assert asyncio.run(processor._process_image(gray, Deadline.after(5))) == "text"
+    assert len(pids()) == 1
+
+
+def assert_killed(pid):
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_ocr_deadline_kills_tesseract(fake_tesseract):
+    pids = fake_tesseract(delay=30)
+    processor = streaming_processor(None)
+    gray = np.full((20, 20), 200, dtype=np.uint8)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(processor._process_image(gray, Deadline(None, {"ocr": 0.5})))
+    assert time.monotonic() - started < 5
+    assert_killed(pids()[0])
+
+
+def test_cancelled_ocr_kills_tesseract(fake_tesseract):
+    pids = fake_tesseract(delay=30)
+    processor = streaming_processor(None)
+    gray = np.full((20, 20), 200, dtype=np.uint8)
+
+    async def cancel_once_started():
+        # No deadline at all: cancellation alone has to stop tesseract
+        task = asyncio.create_task(processor._process_image(gray, Deadline()))
+        while not pids():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(cancel_once_started(), 10))
+    assert_killed(pids()[0])
@@ -0,0 +1,207 @@
+import asyncio
+import random
+from datetime import date
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from config.base import BaseConfig
+from dedup import MultiIndexHash, NearDuplicateIndex, dhash, hamming, phash
+from processors.data_classes.aadhaar_front_dataclass import AadhaarFrontOutput
+from processors.document import InMemoryDocument
+from processors.registry import create_processor
+
+cv2 = pytest.importorskip("cv2")
+
+FRONT = AadhaarFrontOutput(name="Asha Rao", dob=date(1990, 1, 2), gender="F", address="12 MG Road, Pune",
+                           aadhaar_number="123412341234", pincode="411001")
+
+
+def card(seed: int, size=(240, 380)) -> np.ndarray:
+    """Synthetic grayscale card: random blocks and lines, distinct per seed"""
+    rng = np.random.default_rng(seed)
+    image = np.full(size, 235, dtype=np.uint8)
+    for _ in range(12):
+        x, y = rng.integers(0, size[1] - 60), rng.integers(0, size[0] - 30)
+        cv2.rectangle(image, (int(x), int(y)), (int(x) + 60, int(y) + 20), int(rng.integers(0, 120)), -1)
+    return image
+
+
+def upload(gray: np.ndarray, name: str) -> InMemoryDocument:
+    ok, encoded = cv2.imencode(".png", gray)
+    return InMemoryDocument(name=name, data=encoded.tobytes())
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 3, 6, 12])
+def test_multi_index_search_matches_brute_force(max_distance):
+    rng = random.Random(max_distance)
+    # Clustered hashes so small radii have several hits
+    centers = [rng.getrandbits(64) for _ in range(20)]
+    items = set()
+    for center in centers:
+        for _ in range(25):
+            flipped = center
+            for bit in rng.sample(range(64), rng.randrange(max_distance + 3)):
+                flipped ^= 1 << bit
+            items.add(flipped)
+    table = MultiIndexHash(max_distance)
+    for item in items:
+        table.add(item, value=item)
+    assert len(table) == len(items)
+
+    for query in centers + [rng.getrandbits(64) for _ in range(20)]:
+        for radius in range(max_distance + 1):
+            expected = sorted((hamming(query, item), item) for item in items if hamming(query, item) <= radius)
+            found = table.search(query, radius)
+            assert sorted((distance, item) for distance, item, _ in found) == expected
+            assert [distance for distance, _, _ in found] == sorted(distance for distance, _ in expected)
+            assert all(value == item for _, item, value in found)
+
+
+def test_multi_index_rejects_radius_beyond_its_bands():
+    table = MultiIndexHash(3)
+    table.add(1, "a")
+    table.add(1, "b")
+    assert table.search(1, 3) == [(0, 1, "b")]
+    with pytest.raises(ValueError, match="radius 4"):
+        table.search(1, 4)
+
+
+@pytest.mark.parametrize("hash_function", [phash, dhash])
+def test_hash_is_stable_under_recompression_and_resizing(hash_function):
+    original = card(1)
+    assert hash_function(original) == hash_function(original.copy())
+
+    ok, jpeg = cv2.imencode(".jpg", original, [cv2.IMWRITE_JPEG_QUALITY, 60])
+    recompressed = cv2.imdecode(jpeg, cv2.IMREAD_GRAYSCALE)
+    resized = cv2.resize(original, (original.shape[1] * 2, original.shape[0] * 2))
+    brighter = cv2.add(original, 15)
+    for variant in (recompressed, resized, brighter):
+        assert hamming(hash_function(original), hash_function(variant)) <= 6
+
+    others = [hamming(hash_function(original), hash_function(card(seed))) for seed in range(2, 12)]
+    assert min(others) > 6
+
+
+def test_index_keeps_doc_types_apart():
+    index = NearDuplicateIndex()
+    image_hash = index.hash_image(card(1))
+    index.add(image_hash, FRONT, key="front.png", doc_type="aadhaar_front")
+
+    assert index.find(image_hash, doc_type="aadhaar_front").result == FRONT
+    assert index.find(image_hash, doc_type="aadhaar_back") is None
+
+
+class CountingAgent:
+    def __init__(self, output, delay: float = 0.0):
+        self.output = output
+        self.delay = delay
+        self.calls = 0
+
+    async def run(self, prompt, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(output=self.output(prompt) if callable(self.output) else self.output)
+
+
+def processor_with_index(doc_type: str, index: NearDuplicateIndex, output, delay: float = 0.0):
+    processor = create_processor(doc_type, BaseConfig(model_type="test", model_name="test", api_key="",
+                                                      duplicate_index=index))
+    processor.agent = CountingAgent(output, delay)
+
+    async def ocr(gray, deadline):
+        # No tesseract needed: the "text" is the image's mean intensity
+        return f"card {int(gray.mean())}"
+    processor._process_image = ocr
+    return processor
+
+
+def test_reuse_returns_stored_extraction_without_calling_the_model():
+    index = NearDuplicateIndex()
+    processor = processor_with_index("aadhaar_front", index, FRONT)
+    original = card(1)
+
+    assert asyncio.run(processor.process(upload(original, "first.png"))) == FRONT
+    assert asyncio.run(processor.process(upload(cv2.add(original, 10), "again.png"))) == FRONT
+    assert processor.agent.calls == 1
+    # The index keeps the name only, never the uploaded bytes
+    assert index.find(index.hash_image(original), doc_type="aadhaar_front").key == "first.png"
+
+
+def test_match_for_another_doc_type_is_not_reused():
+    index = NearDuplicateIndex()
+    image = card(1)
+    index.add(index.hash_image(image), FRONT, key="front.png", doc_type="aadhaar_front")
+    back = SimpleNamespace()
+    processor = processor_with_index("aadhaar_back", index, back)
+
+    assert asyncio.run(processor.process(upload(image, "back.png"))) is back
+    assert processor.agent.calls == 1
+
+
+def test_flag_mode_extracts_and_records_the_match():
+    index = NearDuplicateIndex(on_match="flag")
+    processor = processor_with_index("aadhaar_front", index, FRONT)
+    image = card(1)
+
+    asyncio.run(processor.process(upload(image, "first.png")))
+    asyncio.run(processor.process(upload(image, "second.png")))
+    assert processor.agent.calls == 2
+    [(key, match)] = index.flagged
+    assert (key, match.key, match.distance) == ("second.png", "first.png", 0)
+
+
+def test_overlapping_requests_keep_their_own_results():
+    index = NearDuplicateIndex()
+    processor = processor_with_index("aadhaar_front", index, lambda prompt: prompt, delay=0.05)
+    first, second = card(1), card(7)
+
+    async def both():
+        return await asyncio.gather(processor.process(upload(first, "a.png")),
+                                    processor.process(upload(second, "b.png")))
+
+    result_a, result_b = asyncio.run(both())
+    assert f"card {int(first.mean())}" in result_a
+    assert f"card {int(second.mean())}" in result_b
+
+
+def test_pdf_after_image_does_not_reuse_stale_match(pdf_document):
+    index = NearDuplicateIndex()
+    processor = processor_with_index("pan", index, lambda prompt: prompt)
+    image = card(1)
+    asyncio.run(processor.process(upload(image, "pan.png")))
+    asyncio.run(processor.process(upload(image, "pan-again.png")))
+
+    assert "ABCDE1234F" in asyncio.run(processor.process(pdf_document("pan.pdf", ["PAN ABCDE1234F"])))
+
+
+def test_process_stream_honours_reuse():
+    index = NearDuplicateIndex()
+    image = card(1)
+    index.add(index.hash_image(image), FRONT, key="front.png", doc_type="aadhaar_front")
+    processor = processor_with_index("aadhaar_front", index, FRONT)
+
+    async def collect():
+        return [partial async for partial in processor.process_stream(upload(image, "again.png"))]
+
+    assert asyncio.run(collect()) == [FRONT]
+    assert processor.agent.calls == 0
+
+
+def test_image_decode_hash_and_lookup_run_off_the_event_loop():
+    import threading
+
+    processor = processor_with_index("aadhaar_front", NearDuplicateIndex(), FRONT)
+    threads = []
+    load_and_lookup = processor._load_and_lookup
+
+    def recording(file_path):
+        threads.append(threading.get_ident())
+        return load_and_lookup(file_path)
+    processor._load_and_lookup = recording
+
+    async def run():
+        await processor.process(upload(card(1), "a.png"))
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert threads and threads[0] != loop_thread
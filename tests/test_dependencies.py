@@ -0,0 +1,88 @@
+from typing import Any, List
+import pytest
+from pydantic import BaseModel
+from config.base import DependencyConfig, compile_type_check
+from dependencies.manager import DependencyManager
+from processors.data_classes.form_16_dataclass import PaymentSummary
+
+PAYMENT = PaymentSummary(amount="100", nature="salary", date="2024-04-30")
+
+
+class Other(BaseModel):
+    amount: str
+
+
+@pytest.mark.parametrize("expected, value, ok", [
+    (List[PaymentSummary], [PAYMENT, PAYMENT], True),
+    (List[PaymentSummary], [], True),
+    (List[PaymentSummary], [PAYMENT, Other(amount="1")], False),
+    (List[PaymentSummary], [{"amount": "100"}], False),
+    (List[PaymentSummary], (PAYMENT,), False),
+    (List[str], ["a", "b"], True),
+    (List[str], ["a", 1], False),
+    (list, [1, "a", PAYMENT], True),
+    (list, "abc", False),
+    (Any, None, True),
+    (Any, object(), True),
+    (str, "ABCDE1234F", True),
+    (str, 10, False),
+    (PaymentSummary, PAYMENT, True),
+    (PaymentSummary, Other(amount="1"), False),
+])
+def test_compile_type_check(expected, value, ok):
+    assert compile_type_check(expected)(value) is ok
+
+
+def test_dependency_config_recompiles_when_type_changes():
+    config = DependencyConfig(name="amounts", type=List[str], description="")
+    check = config.compile_check()
+    assert config.compile_check() is check
+    config.type = List[int]
+    assert config.validate_type([1, 2])
+    assert not config.validate_type(["1"])
+
+
+def config_manager():
+    return DependencyManager({
+        "name": DependencyConfig(name="name", type=str, description="Name"),
+        "payments": DependencyConfig(name="payments", type=List[PaymentSummary], description="", required=False),
+        "extra": DependencyConfig(name="extra", type=Any, description="", required=False),
+    })
+
+
+def test_config_plan_validates_and_drops_unknown_keys():
+    manager = config_manager()
+    deps = {"name": "Asha", "payments": [PAYMENT], "extra": {"k": 1}, "unknown": 1}
+    assert manager.validate_dependencies(deps) == {"name": "Asha", "payments": [PAYMENT], "extra": {"k": 1}}
+    assert manager.validate_dependencies({"name": "Asha"}) == {"name": "Asha"}
+
+
+def test_config_plan_rejects_missing_required_and_wrong_items():
+    manager = config_manager()
+    with pytest.raises(ValueError, match="Required dependency 'name'"):
+        manager.validate_dependencies({"payments": [PAYMENT]})
+    with pytest.raises(TypeError, match="'payments' should be of type List"):
+        manager.validate_dependencies({"name": "Asha", "payments": [PAYMENT, "bad"]})
+
+
+def test_json_schema_plan():
+    manager = DependencyManager({
+        "properties": {
+            "pan_number": {"type": "string"},
+            "income": {"type": "number"},
+            "meta": {"type": "object"},
+        },
+        "required": ["pan_number"],
+    })
+    assert manager.is_json_schema
+    deps = {"pan_number": "ABCDE1234F", "income": 10.5, "meta": [1]}
+    # Types without a registered check are passed through unchecked
+    assert manager.validate_dependencies(deps) == deps
+    assert manager.validate_dependencies({"pan_number": "ABCDE1234F", "income": 3})["income"] == 3
+
+    with pytest.raises(ValueError, match="Required field 'pan_number'"):
+        manager.validate_dependencies({"income": 1})
+    with pytest.raises(TypeError, match="'income' should be a number"):
+        manager.validate_dependencies({"pan_number": "ABCDE1234F", "income": "10"})
+    with pytest.raises(TypeError, match="'pan_number' should be a string"):
+        manager.validate_dependencies({"pan_number": 1234})
@@ -0,0 +1,42 @@
+import asyncio
+import json
+from document_processor import DocumentExtractor
+
+
+def test_extract_dispatches_through_registry(tmp_path, pdf_document):
+    path = tmp_path / "pan.pdf"
+    path.write_bytes(pdf_document("pan.pdf", ["PAN ABCDE1234F"]).data)
+    extractor = DocumentExtractor(api_key="", model_type="test", model_name="test")
+
+    result = json.loads(extractor.extract(str(path), "pan", timeout=30))
+    assert set(result) == {"pan_number", "name", "dob", "gender", "father_name"}
+    # The processor is built once per doc type and reused
+    processor = extractor.get_processor("pan")
+    extractor.extract(str(path), "pan")
+    assert extractor.get_processor("pan") is processor
+
+
+def test_extract_stream_async_yields_complete_result_last(tmp_path, pdf_document):
+    path = tmp_path / "pan.pdf"
+    path.write_bytes(pdf_document("pan.pdf", ["PAN ABCDE1234F"]).data)
+    extractor = DocumentExtractor(api_key="", model_type="test", model_name="test")
+
+    async def collect():
+        return [partial async for partial in extractor.extract_stream_async(str(path), "pan", timeout=30)]
+
+    partials = asyncio.run(collect())
+    assert partials
+    assert set(json.loads(partials[-1])) == {"pan_number", "name", "dob", "gender", "father_name"}
+
+
+def test_sync_extract_reuses_provider_connections_across_calls(tmp_path, pdf_document, openai_stub):
+    path = tmp_path / "pan.pdf"
+    path.write_bytes(pdf_document("pan.pdf", ["PAN ABCDE1234F"]).data)
+
+    with DocumentExtractor(api_key="sk-test", model_type="openai", model_name="gpt-4o") as extractor:
+        # The cached processor's HTTP client must outlive the first call
+        first = json.loads(extractor.extract(str(path), "pan"))
+        second = json.loads(extractor.extract(str(path), "pan"))
+    assert first == second
+    assert first["pan_number"] == "ABCDE1234F"
+    assert len(openai_stub.requests) == 2
@@ -0,0 +1,8 @@
+import asyncio
+from models.fake_model import FakeModel
+from processors.data_classes.pan_dataclass import PANData
+
+
+def test_fake_model_generate_returns_schema_valid_output():
+    result = asyncio.run(FakeModel().generate("PAN ABCDE1234F", output_type=PANData))
+    assert isinstance(result, PANData)
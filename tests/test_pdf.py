@@ -0,0 +1,39 @@
+import pytest
+from processors.deadline import Deadline, DeadlineExceeded
+from processors.pdf import iter_pdf_chunks
+
+PAGES = [f"Page {index} " + "x" * 40 for index in range(12)]
+
+
+@pytest.mark.parametrize("window_pages", [1, 3])
+def test_windowed_extraction_matches_unwindowed(window_pages, pdf_document, tmp_path):
+    document = pdf_document("big.pdf", PAGES)
+    path = tmp_path / "big.pdf"
+    path.write_bytes(document.data)
+
+    for source in (document, str(path)):
+        unwindowed = list(iter_pdf_chunks(source, chunk_size=120))
+        windowed = list(iter_pdf_chunks(source, chunk_size=120, window_pages=window_pages))
+        assert windowed == unwindowed
+        assert len(unwindowed) > 1
+        assert all(f"Page {index} " in "".join(unwindowed) for index in range(len(PAGES)))
+
+
+def test_max_bytes_raises_at_the_page_that_crosses_it(pdf_document):
+    document = pdf_document("big.pdf", PAGES)
+    page_bytes = [len(text.encode("utf-8")) for text in iter_pdf_chunks(document, chunk_size=1)]
+    # Allow exactly four pages; the fifth pushes the total over
+    limit = sum(page_bytes[:4])
+
+    yielded = []
+    with pytest.raises(ValueError, match=r"max_document_bytes \({}\) at page 5".format(limit)):
+        for chunk in iter_pdf_chunks(document, chunk_size=1, max_bytes=limit):
+            yielded.append(chunk)
+    # Page 4 is still being packed when page 5 is read, so pages 1-3 were yielded
+    assert yielded == PAGES[:3]
+    assert len(list(iter_pdf_chunks(document, chunk_size=1, max_bytes=sum(page_bytes)))) == len(PAGES)
+
+
+def test_expired_deadline_stops_before_the_next_page(pdf_document):
+    with pytest.raises(DeadlineExceeded):
+        list(iter_pdf_chunks(pdf_document("big.pdf", PAGES), chunk_size=120, deadline=Deadline.after(0)))
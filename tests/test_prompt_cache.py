@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+import pytest
+from agent.prompt_cache import PromptCacheStats, prompt_cache_settings
+from config.base import BaseConfig
+from processors.registry import create_processor
+
+
+def config(model_type, **overrides):
+    return BaseConfig(model_type=model_type, model_name="model", api_key="", **overrides)
+
+
+def test_prompt_cache_settings_per_provider():
+    assert prompt_cache_settings(config("anthropic"), "pan") == {
+        "anthropic_cache_tool_definitions": True,
+        "anthropic_cache_instructions": True,
+    }
+    assert prompt_cache_settings(config("openai"), "pan") == {
+        "extra_body": {"prompt_cache_key": "gov-doc-parser:pan"}
+    }
+    assert prompt_cache_settings(config("openai"), None)["extra_body"]["prompt_cache_key"] == "gov-doc-parser:default"
+    assert prompt_cache_settings(config("test"), "pan") == {}
+    assert prompt_cache_settings(config("anthropic", prompt_caching=False), "pan") == {}
+    assert prompt_cache_settings(config("openai", prompt_caching=False), "pan") == {}
+
+
+def usage(input_tokens, cached=0):
+    return SimpleNamespace(input_tokens=input_tokens, cache_read_tokens=cached)
+
+
+def test_stats_report_hits_cached_tokens_and_latency():
+    stats = PromptCacheStats()
+    stats.record("pan", usage(1000), seconds=2.0)
+    stats.record("pan", usage(1000, cached=800), seconds=1.0)
+    stats.record("pan", usage(1000, cached=800), seconds=0.5)
+    stats.record("pan", None, seconds=9.0)  # Replayed results carry no usage
+    # Older usage objects keep provider counters in details
+    stats.record("form16", SimpleNamespace(request_tokens=400, details={"cached_tokens": 100}))
+
+    report = stats.report()
+    assert report["pan"] == {
+        "calls": 3,
+        "hit_rate": 2 / 3,
+        "cached_input_ratio": 1600 / 3000,
+        "mean_latency_hit": 0.75,
+        "mean_latency_miss": 2.0,
+        "mean_first_token_hit": None,
+        "mean_first_token_miss": None,
+    }
+    assert report["form16"]["hit_rate"] == 1.0
+    assert report["form16"]["cached_input_ratio"] == 0.25
+    assert report["form16"]["mean_latency_hit"] is None
+
+
+def test_streamed_time_to_first_token_is_kept_apart_from_full_latency():
+    stats = PromptCacheStats()
+    stats.record("pan", usage(1000), seconds=3.0)
+    stats.record("pan", usage(1000), seconds=0.25, streamed=True)
+    stats.record("pan", usage(1000, cached=900), seconds=0.125, streamed=True)
+
+    report = stats.report()["pan"]
+    assert report["calls"] == 3
+    assert (report["mean_latency_miss"], report["mean_latency_hit"]) == (3.0, None)
+    assert (report["mean_first_token_miss"], report["mean_first_token_hit"]) == (0.25, 0.125)
+
+    stats.reset()
+    assert stats.report() == {}
+    stats.record("pan", usage(10), seconds=1.0)
+    assert stats.report()["pan"]["mean_first_token_miss"] is None
+
+
+def test_stats_are_safe_to_share_across_threads():
+    stats = PromptCacheStats()
+
+    def record():
+        for _ in range(1000):
+            stats.record("pan", usage(10, cached=5), seconds=0.001)
+            stats.record("pan", usage(10), seconds=0.001, streamed=True)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report = stats.report()["pan"]
+    assert report["calls"] == 16000
+    assert report["hit_rate"] == 0.5
+    assert report["mean_latency_hit"] == pytest.approx(0.001)
+    assert report["mean_first_token_miss"] == pytest.approx(0.001)
+
+
+def test_instructions_are_in_the_system_prompt_ahead_of_the_document(pdf_document):
+    from pydantic_ai import capture_run_messages
+    from pydantic_ai.messages import SystemPromptPart, UserPromptPart
+
+    processor = create_processor("pan", BaseConfig(model_type="test", model_name="test", api_key=""))
+    with capture_run_messages() as messages:
+        asyncio.run(processor.process(pdf_document("pan.pdf", ["PAN ABCDE1234F"])))
+
+    parts = messages[0].parts
+    system = [part.content for part in parts if isinstance(part, SystemPromptPart)]
+    user = [part.content for part in parts if isinstance(part, UserPromptPart)]
+    assert system == [processor.agent_system_prompt]
+    assert processor.prompt_instructions in system[0]
+    # Only the document text varies between requests
+    assert len(user) == 1 and user[0].startswith("Document Text:\n")
+    assert "ABCDE1234F" in user[0] and processor.prompt_instructions not in user[0]
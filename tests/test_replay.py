@@ -0,0 +1,75 @@
+import asyncio
+import os
+import pytest
+from agent.cascade import CascadeStats
+from agent.replay import RecordingAgent, ReplayAgent, ReplayMiss
+from config.base import BaseConfig, ModelRouteConfig
+from processors.registry import create_processor
+
+
+def pan_processor(replay_dir, mode, **overrides):
+    config = BaseConfig(model_type="test", model_name="test", api_key="", replay_mode=mode,
+                        replay_dir=str(replay_dir), **overrides)
+    return create_processor("pan", config)
+
+
+def recorded_files(replay_dir):
+    return sorted(name for _, _, files in os.walk(replay_dir) for name in files)
+
+
+def test_record_then_replay_round_trip(tmp_path, pdf_document):
+    document = pdf_document("pan.pdf", ["PAN ABCDE1234F"])
+    recorder = pan_processor(tmp_path, "record")
+    assert isinstance(recorder.agent, RecordingAgent)
+    recorded = asyncio.run(recorder.process(document))
+    assert len(recorded_files(tmp_path)) == 1
+
+    replayer = pan_processor(tmp_path, "replay")
+    assert isinstance(replayer.agent, ReplayAgent)
+    assert asyncio.run(replayer.process(document)) == recorded
+
+
+def test_replay_miss_for_an_unrecorded_prompt(tmp_path, pdf_document):
+    asyncio.run(pan_processor(tmp_path, "record").process(pdf_document("pan.pdf", ["PAN ABCDE1234F"])))
+
+    with pytest.raises(ReplayMiss, match=str(tmp_path)):
+        asyncio.run(pan_processor(tmp_path, "replay").process(pdf_document("pan.pdf", ["PAN ZZZZZ9999Z"])))
+
+
+def test_cascade_escalates_when_the_cheap_model_has_no_recording(tmp_path, pdf_document):
+    document = pdf_document("pan.pdf", ["PAN ABCDE1234F"])
+    # Recorded without a cascade, so only the configured model's responses exist
+    recorded = asyncio.run(pan_processor(tmp_path, "record").process(document))
+
+    replayer = pan_processor(tmp_path, "replay", cascade_model=ModelRouteConfig(model_type="test", model_name="cheap"))
+    replayer.cascade_stats = CascadeStats()
+    assert isinstance(replayer.cascade_agent, ReplayAgent)
+    assert asyncio.run(replayer.process(document)) == recorded
+    assert replayer.cascade_stats.report()["pan"]["escalations"] == 1
+
+
+def test_streamed_runs_are_recorded_and_replay_through_process(tmp_path, pdf_document):
+    document = pdf_document("pan.pdf", ["PAN ABCDE1234F"])
+
+    async def stream(processor):
+        return [partial async for partial in processor.process_stream(document)]
+
+    partials = asyncio.run(stream(pan_processor(tmp_path, "record")))
+    assert len(recorded_files(tmp_path)) == 1
+
+    replayer = pan_processor(tmp_path, "replay")
+    assert asyncio.run(replayer.process(document)) == partials[-1]
+    assert asyncio.run(stream(replayer)) == [partials[-1]]
+
+
+def test_abandoned_stream_is_not_recorded(tmp_path, pdf_document):
+    document = pdf_document("pan.pdf", ["PAN ABCDE1234F"])
+
+    async def first_partial(processor):
+        stream = processor.process_stream(document)
+        partial = await stream.__anext__()
+        await stream.aclose()
+        return partial
+
+    asyncio.run(first_partial(pan_processor(tmp_path, "record")))
+    assert recorded_files(tmp_path) == []
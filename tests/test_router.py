@@ -0,0 +1,70 @@
+import asyncio
+from pydantic import BaseModel
+from agent.factory import AIAgentFactory
+from agent.router import HedgedAgent, LatencyTracker, latency_trackers
+from config.base import BaseConfig, ModelRouteConfig
+
+
+class Output(BaseModel):
+    value: str
+
+
+class SleepyAgent:
+    def __init__(self, delay: float, value: str):
+        self.delay = delay
+        self.value = value
+        self.cancelled = False
+
+    async def run(self, *args, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.value
+
+
+def test_hedge_win_records_primary_lower_bound():
+    tracker = LatencyTracker()
+    primary = SleepyAgent(1.0, "primary")
+    hedged = HedgedAgent(primary, SleepyAgent(0.0, "secondary"), hedge_delay=0.05, tracker=tracker)
+
+    assert asyncio.run(hedged.run("prompt")) == "secondary"
+    assert hedged.hedge_wins == 1
+    assert primary.cancelled
+    assert len(tracker) == 1
+    assert tracker.percentile(95) >= 0.05
+
+
+def test_fast_primary_is_not_hedged():
+    tracker = LatencyTracker()
+    hedged = HedgedAgent(SleepyAgent(0.0, "primary"), SleepyAgent(0.0, "secondary"),
+                         hedge_delay=0.5, tracker=tracker)
+
+    assert asyncio.run(hedged.run("prompt")) == "primary"
+    assert hedged.hedged_requests == 0
+    assert len(tracker) == 1
+
+
+def test_p95_delay_waits_for_min_samples():
+    tracker = LatencyTracker()
+    hedged = HedgedAgent(None, None, min_samples=3, tracker=tracker)
+    for seconds in (0.1, 0.2):
+        tracker.record(seconds)
+    assert hedged.current_delay() is None
+    tracker.record(0.3)
+    assert hedged.current_delay() == 0.3
+
+
+def test_processors_share_a_tracker_per_doc_type_and_model():
+    latency_trackers.reset()
+    config = BaseConfig(
+        model_type="test", model_name="test", api_key="",
+        hedge_model=ModelRouteConfig(model_type="test", model_name="test-hedge")
+    )
+    first = AIAgentFactory.create_agent(config, Output, "system", doc_type="pan")
+    second = AIAgentFactory.create_agent(config, Output, "system", doc_type="pan")
+    other = AIAgentFactory.create_agent(config, Output, "system", doc_type="form16")
+
+    assert first.tracker is second.tracker
+    assert first.tracker is not other.tracker
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from config.base import BaseConfig
+
+pytest.importorskip("python_multipart")
+from starlette.testclient import TestClient  # noqa: E402
+from server.app import DEFAULT_REQUEST_TIMEOUT, UploadError, create_app, read_upload  # noqa: E402
+
+PAN_FIELDS = {"pan_number", "name", "dob", "gender", "father_name"}
+BOUNDARY = "x-boundary"
+
+
+def multipart(parts):
+    """Encode (name, filename, data) parts as a multipart/form-data body"""
+    body = b""
+    for name, filename, data in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        body += (f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n").encode() + data + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+class ChunkedRequest:
+    """Stand-in for starlette's Request that delivers the body in small chunks"""
+
+    def __init__(self, body: bytes, content_type: str, chunk_size: int = 7, query_params=None):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.headers = {"content-type": content_type}
+        self.query_params = query_params or {}
+        self.chunks_read = 0
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            self.chunks_read += 1
+            yield self.body[start:start + self.chunk_size]
+        yield b""
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app(BaseConfig(model_type="test", model_name="test", api_key="")))
+
+
+def test_multipart_upload_is_extracted_with_one_processor_per_doc_type(client, pdf_document):
+    pdf = pdf_document("pan.pdf", ["PAN ABCDE1234F"]).data
+    body = multipart([("note", None, b"ignored"), ("file", "pan.pdf", pdf)])
+    headers = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+
+    response = client.post("/extract/pan", content=body, headers=headers)
+    assert response.status_code == 200
+    assert set(response.json()["result"]) == PAN_FIELDS
+
+    service = client.app.state.service
+    processor = service.processors["pan"]
+    assert client.post("/extract/pan", content=body, headers=headers).status_code == 200
+    assert service.processors == {"pan": processor}
+
+
+def test_multipart_body_is_parsed_chunk_by_chunk(pdf_document):
+    pdf = pdf_document("pan.pdf", ["PAN ABCDE1234F"]).data
+    request = ChunkedRequest(multipart([("file", "pan.pdf", pdf)]), f"multipart/form-data; boundary={BOUNDARY}")
+
+    document = asyncio.run(read_upload(request, max_bytes=1 << 20))
+    assert (document.name, document.data) == ("pan.pdf", pdf)
+    assert request.chunks_read > 10
+
+
+def test_oversized_multipart_is_rejected_before_the_body_is_read(pdf_document):
+    pdf = pdf_document("pan.pdf", ["PAN ABCDE1234F"]).data
+    request = ChunkedRequest(multipart([("file", "pan.pdf", pdf)]), f"multipart/form-data; boundary={BOUNDARY}")
+
+    with pytest.raises(UploadError) as error:
+        asyncio.run(read_upload(request, max_bytes=100))
+    assert error.value.status_code == 413
+    assert request.chunks_read == 100 // request.chunk_size + 1
+
+
+def test_raw_body_is_joined_once(pdf_document):
+    pdf = pdf_document("pan.pdf", ["PAN ABCDE1234F"]).data
+    document = asyncio.run(read_upload(ChunkedRequest(pdf, "application/pdf"), max_bytes=1 << 20))
+    assert (document.name, document.data) == ("upload.pdf", pdf)
+
+
+@pytest.mark.parametrize("body, detail", [
+    (multipart([("note", None, b"no file here")]), "no 'file' field"),
+    (b"--x-boundary\r\nnot a header line\r\n\r\n", "Malformed multipart body"),
+])
+def test_bad_multipart_is_a_client_error(client, body, detail):
+    response = client.post("/extract/pan", content=body,
+                           headers={"content-type": f"multipart/form-data; boundary={BOUNDARY}"})
+    assert response.status_code == 400
+    assert detail in response.json()["error"]
+    assert client.app.state.service.in_flight == 0
+
+
+def test_documents_get_a_default_request_timeout():
+    service = create_app(BaseConfig(model_type="test", model_name="test", api_key="")).state.service
+    assert service.config.request_timeout == DEFAULT_REQUEST_TIMEOUT
+    assert service.get_processor("pan").request_timeout == DEFAULT_REQUEST_TIMEOUT
+
+    configured = BaseConfig(model_type="test", model_name="test", api_key="", request_timeout=5)
+    assert create_app(configured).state.service.config.request_timeout == 5
+    assert create_app(configured.model_copy(update={"request_timeout": None}),
+                      request_timeout=30).state.service.config.request_timeout == 30